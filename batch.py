@@ -0,0 +1,286 @@
+"""Move generation for many boards at once with NumPy.
+
+A batch of N positions is an (N, 12) uint64 array of bitboards: plane
+color * 6 + piece_type holds that color's pieces of that type, with squares
+numbered as in bitboard.py.  The side to move is an (N,) array of color codes
+and castling rights an (N,) array of the rules module's rights bits.
+
+Attack sets are computed for the whole batch with array operations: leapers
+by shifting and masking off the columns a jump would wrap around, sliders by
+Kogge-Stone occluded fills.  Per-piece targets run the same fills on a flat
+array holding one generator bit per piece of the side to move, so no Python
+loop runs over boards or pieces.  Moves are pseudo-legal and follow the rules module:
+castling, no promotion or en passant.
+
+    bitboards, colors, castling = from_boards(boards)
+    moves, counts = move_arrays(bitboards, colors, castling)
+
+NumPy is needed for this module only.
+"""
+import numpy as np
+
+from bitboard import ROWS, COLS, SQUARES, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, PIECE_TYPES, square
+from moves import CAPTURE, CASTLE, END_SHIFT
+from rules import CASTLING_HOMES, CASTLING_PATHS, CASTLING_RIGHTS, PAWN_START_ROWS
+
+PLANES = 2 * len(PIECE_TYPES)
+MAILBOX_EMPTY = 0  # Mailbox codes: 1 + piece_type for white, -(1 + piece_type) for black
+
+# encoding.py record layout
+_RECORD_DTYPE = np.dtype([('occupied', '<u8'), ('pieces', 'u1', 16), ('flags', 'u1'), ('halfmove', 'u1'),
+                          ('padding', 'u1', 2), ('ply', '<u4')])
+
+SQUARE_BITS = np.left_shift(np.uint64(1), np.arange(SQUARES, dtype=np.uint64))
+
+
+def _row_mask(row):
+    return sum(1 << square(row, col) for col in range(COLS))
+
+
+def _landing_mask(dc):
+    """Squares a jump of dc columns can land on without wrapping around the board edge."""
+    return sum(1 << square(row, col) for row in range(ROWS) for col in range(COLS) if 0 <= col - dc < COLS)
+
+
+def _directions(offsets):
+    """(square offset, landing mask) per (dr, dc) step."""
+    return tuple((dr * COLS + dc, np.uint64(_landing_mask(dc))) for dr, dc in offsets)
+
+
+KNIGHT_DIRECTIONS = _directions([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_DIRECTIONS = _directions([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+ROOK_DIRECTIONS = _directions([(-1, 0), (1, 0), (0, -1), (0, 1)])
+BISHOP_DIRECTIONS = _directions([(-1, -1), (-1, 1), (1, -1), (1, 1)])
+# Per color: (push offset, capture directions, mask of the row a double step passes through)
+PAWN_GEOMETRY = tuple(
+    (step * COLS, _directions([(step, -1), (step, 1)]), np.uint64(_row_mask(start_row + step)))
+    for step, start_row in zip((-1, 1), PAWN_START_ROWS)
+)
+
+# Per color: (right, king destination bit, squares that must be empty, squares that must not be attacked)
+CASTLING_MASKS = tuple(
+    tuple((right, np.uint64(1 << square(CASTLING_HOMES[right][1], CASTLING_PATHS[right][0])),
+           np.uint64(CASTLING_PATHS[right][2]), np.uint64(sum(1 << sq for sq in CASTLING_PATHS[right][3])))
+          for right in rights)
+    for rights in CASTLING_RIGHTS
+)
+
+
+def _shift(bitboards, offset):
+    """Moves every bit offset squares up (positive) or down (negative)."""
+    if offset > 0:
+        return np.left_shift(bitboards, np.uint64(offset))
+    return np.right_shift(bitboards, np.uint64(-offset))
+
+
+def leaper_attacks(bitboards, directions):
+    """Returns the union of one-step jumps from every set bit, elementwise."""
+    attacks = np.zeros_like(bitboards)
+    for offset, mask in directions:
+        attacks |= _shift(bitboards, offset) & mask
+    return attacks
+
+
+def _fill(generators, empty, offset, mask):
+    """Kogge-Stone occluded fill: slides the generators along one direction through
+    empty squares and returns the attacked squares, first blocker included."""
+    empty = empty & mask
+    generators = generators | (empty & _shift(generators, offset))
+    empty = empty & _shift(empty, offset)
+    generators = generators | (empty & _shift(generators, 2 * offset))
+    empty = empty & _shift(empty, 2 * offset)
+    generators = generators | (empty & _shift(generators, 4 * offset))
+    return _shift(generators, offset) & mask
+
+
+def slider_attacks(bitboards, occupied, directions):
+    """Returns the squares the sliders in bitboards reach along the given directions.
+    occupied must broadcast against bitboards."""
+    empty = ~occupied
+    attacks = np.zeros_like(bitboards)
+    for offset, mask in directions:
+        attacks |= _fill(bitboards, empty, offset, mask)
+    return attacks
+
+
+def attack_maps(bitboards, color):
+    """Returns the (N,) union of squares attacked by the given color's pieces.
+    color may be a scalar color code or an (N,) array of them."""
+    color = np.broadcast_to(np.asarray(color), bitboards.shape[:1])
+    pieces = np.where((color == WHITE)[:, None], bitboards[:, :6], bitboards[:, 6:])
+    occupied = np.bitwise_or.reduce(bitboards, axis=1)
+    attacks = leaper_attacks(pieces[:, KNIGHT], KNIGHT_DIRECTIONS)
+    attacks |= leaper_attacks(pieces[:, KING], KING_DIRECTIONS)
+    attacks |= slider_attacks(pieces[:, BISHOP] | pieces[:, QUEEN], occupied, BISHOP_DIRECTIONS)
+    attacks |= slider_attacks(pieces[:, ROOK] | pieces[:, QUEEN], occupied, ROOK_DIRECTIONS)
+    for pawn_color in (WHITE, BLACK):
+        pawns = np.where(color == pawn_color, pieces[:, PAWN], np.uint64(0))
+        attacks |= leaper_attacks(pawns, PAWN_GEOMETRY[pawn_color][1])
+    return attacks
+
+
+def _unpack(masks):
+    """Expands uint64 masks into a trailing axis of 64 bits (uint8), bit 0 first."""
+    return np.unpackbits(masks.astype('<u8').view(np.uint8), axis=-1, bitorder='little')
+
+
+def _popcount(masks):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.int64)
+    return _unpack(masks[..., None]).sum(axis=-1, dtype=np.int64)
+
+
+def piece_targets(bitboards, colors, castling=None):
+    """Returns flat arrays (boards, starts, targets) with one entry per piece of the
+    side to move: its board index, its square and the mask of squares it can move
+    to, castling included when rights are given.  Entries are ordered by board,
+    then square."""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    colors = np.asarray(colors)
+    white = (colors == WHITE)[:, None]
+    own = np.where(white, bitboards[:, :6], bitboards[:, 6:])
+    own_occupied = np.bitwise_or.reduce(own, axis=1)
+    enemy_occupied = np.bitwise_or.reduce(np.where(white, bitboards[:, 6:], bitboards[:, :6]), axis=1)
+    occupied = own_occupied | enemy_occupied
+
+    # One generator bit per piece, found in square-major order so the flat
+    # indices come out ordered by board, then square
+    bits = _unpack(own[:, :, None]).reshape(len(own), len(PIECE_TYPES), SQUARES).transpose(0, 2, 1)
+    boards, index = np.divmod(np.flatnonzero(bits), SQUARES * len(PIECE_TYPES))
+    starts, types = np.divmod(index, len(PIECE_TYPES))
+    generators = SQUARE_BITS[starts]
+    blockers = occupied[boards]
+    targets = np.zeros(len(boards), dtype=np.uint64)
+
+    for piece_type, directions in ((KNIGHT, KNIGHT_DIRECTIONS), (KING, KING_DIRECTIONS)):
+        selected = types == piece_type
+        targets[selected] = leaper_attacks(generators[selected], directions)
+    for piece_type in (BISHOP, ROOK, QUEEN):
+        selected = types == piece_type
+        attacks = np.zeros(np.count_nonzero(selected), dtype=np.uint64)
+        if piece_type != ROOK:
+            attacks |= slider_attacks(generators[selected], blockers[selected], BISHOP_DIRECTIONS)
+        if piece_type != BISHOP:
+            attacks |= slider_attacks(generators[selected], blockers[selected], ROOK_DIRECTIONS)
+        targets[selected] = attacks
+    targets &= ~own_occupied[boards]
+
+    # Pawns capture diagonally and push onto empty squares, two from the start row
+    for color in (WHITE, BLACK):
+        selected = (types == PAWN) & (colors[boards] == color)
+        push, directions, passed_row = PAWN_GEOMETRY[color]
+        pawns, empty = generators[selected], ~blockers[selected]
+        single = _shift(pawns, push) & empty
+        double = _shift(single & passed_row, push) & empty
+        targets[selected] = single | double | (leaper_attacks(pawns, directions) & enemy_occupied[boards[selected]])
+
+    if castling is not None:
+        kings = types == KING
+        targets[kings] |= _castling_targets(bitboards, colors, castling, occupied)[boards[kings]]
+    return boards, starts, targets
+
+
+def target_masks(bitboards, colors, castling=None):
+    """Returns an (N, 64) uint64 array: entry [i, sq] is the mask of squares the side
+    to move's piece on sq can move to in board i (0 where it has no piece)."""
+    boards, starts, targets = piece_targets(bitboards, colors, castling)
+    masks = np.zeros((len(colors), SQUARES), dtype=np.uint64)
+    masks[boards, starts] = targets
+    return masks
+
+
+def _castling_targets(bitboards, colors, castling, occupied):
+    """Returns the (N,) mask of squares the side to move's king can castle to."""
+    castling = np.asarray(castling)
+    attacked = attack_maps(bitboards, colors ^ 1)
+    targets = np.zeros(len(colors), dtype=np.uint64)
+    for color in (WHITE, BLACK):
+        for right, king_to, between, safe in CASTLING_MASKS[color]:
+            allowed = ((colors == color) & (castling & right != 0) &
+                       ((occupied & between) == 0) & ((attacked & safe) == 0))
+            targets |= np.where(allowed, king_to, np.uint64(0))
+    return targets
+
+
+def move_counts(bitboards, colors, castling=None):
+    """Returns the (N,) number of moves available to the side to move in each board."""
+    boards, _, targets = piece_targets(bitboards, colors, castling)
+    return np.bincount(boards, weights=_popcount(targets), minlength=len(colors)).astype(np.int64)
+
+
+def move_arrays(bitboards, colors, castling=None):
+    """Returns (moves, counts): an (N, max count) uint16 array of packed moves, as
+    in moves.py, padded with zeros, and the (N,) number of moves per board.
+    Each board's moves are ordered by start square, then end square."""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    colors = np.asarray(colors)
+    piece_boards, piece_starts, targets = piece_targets(bitboards, colors, castling)
+    pieces, ends = np.divmod(np.flatnonzero(_unpack(targets[:, None])), SQUARES)
+    boards, starts = piece_boards[pieces], piece_starts[pieces]
+    counts = np.bincount(boards, minlength=len(colors))
+
+    enemy = np.where(colors == WHITE, np.bitwise_or.reduce(bitboards[:, 6:], axis=1),
+                     np.bitwise_or.reduce(bitboards[:, :6], axis=1))
+    kings = np.where(colors == WHITE, bitboards[:, KING], bitboards[:, 6 + KING])
+    captures = (enemy[boards] & SQUARE_BITS[ends]) != 0
+    castles = ((kings[boards] & SQUARE_BITS[starts]) != 0) & (np.abs(ends - starts) == 2)
+    packed = (starts | ends << END_SHIFT | np.where(captures, CAPTURE, 0) | np.where(castles, CASTLE, 0)).astype(np.uint16)
+
+    moves = np.zeros((len(colors), counts.max(initial=0)), dtype=np.uint16)
+    first = np.cumsum(counts) - counts
+    moves[boards, np.arange(len(boards)) - first[boards]] = packed
+    return moves, counts
+
+
+def from_positions(positions):
+    """Stacks bitboard.Position objects into an (N, 12) uint64 array plus (N,) castling rights."""
+    bitboards = np.array([[mask for color_masks in position.pieces for mask in color_masks] for position in positions],
+                         dtype=np.uint64).reshape(-1, PLANES)
+    castling = np.array([position.castling_rights for position in positions], dtype=np.uint8)
+    return bitboards, castling
+
+
+def from_boards(boards):
+    """Returns (bitboards, colors, castling) arrays for a sequence of rules.Board objects."""
+    bitboards, castling = from_positions([board.position for board in boards])
+    colors = np.array([board.side_to_move for board in boards], dtype=np.uint8)
+    return bitboards, colors, castling
+
+
+def from_records(buffer):
+    """Returns (bitboards, colors, castling) arrays for a buffer of encoding.py
+    position records, decoded without building any Python objects per position."""
+    records = np.frombuffer(buffer, dtype=_RECORD_DTYPE, count=len(buffer) // _RECORD_DTYPE.itemsize)
+    occupied = _unpack(records['occupied'][:, None]).astype(bool)
+    packed = records['pieces']
+    nibbles = np.stack((packed & 0xF, packed >> 4), axis=-1).reshape(len(records), -1)
+    # The k-th occupied square holds the k-th nibble
+    index = np.cumsum(occupied, axis=1) - 1
+    codes = np.take_along_axis(nibbles, np.maximum(index, 0), axis=1).astype(np.int8)
+    mailbox = np.where(occupied, np.where(codes >> 3 == BLACK, -1, 1) * (1 + (codes & 7)), MAILBOX_EMPTY)
+    colors = (records['flags'] & 1).astype(np.uint8)
+    castling = (records['flags'] >> 4).astype(np.uint8)
+    return mailbox_to_bitboards(mailbox), colors, castling
+
+
+def mailbox_to_bitboards(mailbox):
+    """Converts an (N, 64) int8 mailbox (see MAILBOX_EMPTY) to an (N, 12) uint64 bitboard stack."""
+    mailbox = np.asarray(mailbox, dtype=np.int8)
+    bitboards = np.zeros((len(mailbox), PLANES), dtype=np.uint64)
+    for color, sign in ((WHITE, 1), (BLACK, -1)):
+        for piece_type in PIECE_TYPES:
+            on_square = mailbox == sign * (1 + piece_type)
+            bitboards[:, color * 6 + piece_type] = np.bitwise_or.reduce(
+                np.where(on_square, SQUARE_BITS, np.uint64(0)), axis=1)
+    return bitboards
+
+
+def bitboards_to_mailbox(bitboards):
+    """Converts an (N, 12) uint64 bitboard stack to an (N, 64) int8 mailbox."""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    mailbox = np.full((len(bitboards), SQUARES), MAILBOX_EMPTY, dtype=np.int8)
+    for color, sign in ((WHITE, 1), (BLACK, -1)):
+        for piece_type in PIECE_TYPES:
+            on_square = (bitboards[:, color * 6 + piece_type, None] & SQUARE_BITS) != 0
+            mailbox[on_square] = sign * (1 + piece_type)
+    return mailbox
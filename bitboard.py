@@ -0,0 +1,207 @@
+"""Bitboard position representation for the rules core.
+
+Squares are numbered row * COLS + col, matching the (row, col) coordinates
+used everywhere else: square 0 is the top-left corner as drawn (black's
+queen-side rook) and square 63 is white's king-side rook.  Bit n of a mask is
+set when square n belongs to the set.
+"""
+
+# --- Constants ---
+ROWS, COLS = 8, 8
+SQUARES = ROWS * COLS
+
+# --- Colors and piece types ---
+# Small integer codes index the bitboard and table lookups; names are only for the UI.
+WHITE, BLACK = 0, 1
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+COLORS = (WHITE, BLACK)
+PIECE_TYPES = (PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING)
+COLOR_NAMES = ('white', 'black')
+PIECE_NAMES = ('pawn', 'knight', 'bishop', 'rook', 'queen', 'king')
+
+# square -> (row, col), so generators can hand out coordinates without divmod
+SQUARE_COORDS = tuple(divmod(sq, COLS) for sq in range(SQUARES))
+# Squares drawn in the light color (a8, the top-left corner, is light)
+LIGHT_SQUARES = sum(1 << sq for sq, (row, col) in enumerate(SQUARE_COORDS) if (row + col) % 2 == 0)
+
+
+def square(row, col):
+    """Returns the square index for the given row and column."""
+    return row * COLS + col
+
+
+def square_name(sq):
+    """Returns the algebraic name of a square, e.g. 'e2' for white's king pawn."""
+    row, col = SQUARE_COORDS[sq]
+    return 'abcdefgh'[col] + str(ROWS - row)
+
+
+def parse_square(name):
+    """Returns the square index for an algebraic name such as 'e2'."""
+    col = 'abcdefgh'.index(name[0])
+    row = ROWS - int(name[1])
+    if not 0 <= row < ROWS:
+        raise ValueError(f"invalid square: {name!r}")
+    return square(row, col)
+
+
+def iter_squares(mask):
+    """Yields the square index of every set bit in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask):
+    """Returns the number of set bits in mask."""
+    return bin(mask).count('1')
+
+
+def _leaper_attacks(offsets):
+    """Builds a per-square table of destination masks for a fixed set of (dr, dc) jumps."""
+    table = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            mask = 0
+            for dr, dc in offsets:
+                new_row, new_col = row + dr, col + dc
+                if 0 <= new_row < ROWS and 0 <= new_col < COLS:
+                    mask |= 1 << square(new_row, new_col)
+            table.append(mask)
+    return tuple(table)
+
+
+KNIGHT_ATTACKS = _leaper_attacks([
+    (-2, -1), (-2, 1), (-1, -2), (-1, 2),
+    (1, -2), (1, 2), (2, -1), (2, 1)
+])
+KING_ATTACKS = _leaper_attacks([
+    (-1, -1), (-1, 0), (-1, 1),
+    (0, -1), (0, 1),
+    (1, -1), (1, 0), (1, 1)
+])
+# Diagonal capture squares of a pawn, per color; white pawns move towards row 0
+PAWN_ATTACKS = (
+    _leaper_attacks([(-1, -1), (-1, 1)]),
+    _leaper_attacks([(1, -1), (1, 1)]),
+)
+
+
+def _ray_table(dr, dc):
+    """Builds a per-square table of the squares strictly beyond sq in direction (dr, dc)."""
+    table = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            mask = 0
+            new_row, new_col = row + dr, col + dc
+            while 0 <= new_row < ROWS and 0 <= new_col < COLS:
+                mask |= 1 << square(new_row, new_col)
+                new_row, new_col = new_row + dr, new_col + dc
+            table.append(mask)
+    return tuple(table)
+
+
+# (ray table, whether square indices increase along the ray) per direction.
+# Along an increasing ray the nearest blocker is the lowest set bit, otherwise the highest.
+ROOK_RAYS = tuple((_ray_table(dr, dc), dr > 0 or (dr == 0 and dc > 0))
+                  for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)])
+BISHOP_RAYS = tuple((_ray_table(dr, dc), dr > 0)
+                    for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1)])
+
+
+def _sliding_attacks(rays, sq, occupied):
+    attacks = 0
+    for table, increasing in rays:
+        ray = table[sq]
+        blockers = ray & occupied
+        if blockers:
+            if increasing:
+                blocker = (blockers & -blockers).bit_length() - 1
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= table[blocker]  # Cut the ray off behind the first blocker
+        attacks |= ray
+    return attacks
+
+
+def rook_attacks(sq, occupied):
+    """Returns the squares a rook on sq reaches, including the first blocker in each direction."""
+    return _sliding_attacks(ROOK_RAYS, sq, occupied)
+
+
+def bishop_attacks(sq, occupied):
+    """Returns the squares a bishop on sq reaches, including the first blocker in each direction."""
+    return _sliding_attacks(BISHOP_RAYS, sq, occupied)
+
+
+def queen_attacks(sq, occupied):
+    """Returns the squares a queen on sq reaches, including the first blocker in each direction."""
+    return _sliding_attacks(ROOK_RAYS, sq, occupied) | _sliding_attacks(BISHOP_RAYS, sq, occupied)
+
+
+class Position:
+    """Piece placement as one 64-bit mask per color and piece type.
+
+    `occupancy[color]` is the union of that color's masks and `occupied` is
+    the union of both colors, so emptiness and ownership tests are a single
+    AND against an integer.  `castling_rights` holds the rules module's
+    castling-rights bits, which king move generation needs alongside the
+    placement.
+    """
+
+    def __init__(self):
+        self.pieces = [[0] * len(PIECE_TYPES) for _ in COLORS]  # [color][piece type]
+        self.occupancy = [0] * len(COLORS)
+        self.occupied = 0
+        self.castling_rights = 0
+
+    @classmethod
+    def from_grid(cls, grid):
+        """Builds a position from a ROWS x COLS grid of pieces (or None)."""
+        position = cls()
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = grid[row][col]
+                if piece:
+                    position.put(piece.color, piece.piece_type, square(row, col))
+        return position
+
+    def put(self, color, piece_type, sq):
+        """Places a piece on an empty square."""
+        bit = 1 << sq
+        self.pieces[color][piece_type] |= bit
+        self.occupancy[color] |= bit
+        self.occupied |= bit
+
+    def remove(self, color, piece_type, sq):
+        """Removes the piece standing on sq."""
+        bit = 1 << sq
+        self.pieces[color][piece_type] ^= bit
+        self.occupancy[color] ^= bit
+        self.occupied ^= bit
+
+    def move(self, color, piece_type, start, end):
+        """Moves a piece from start to the empty square end."""
+        bits = (1 << start) | (1 << end)
+        self.pieces[color][piece_type] ^= bits
+        self.occupancy[color] ^= bits
+        self.occupied ^= bits
+
+    def is_attacked(self, sq, color):
+        """Returns True if any piece of the given color attacks sq.
+
+        Works backwards from the target square: it looks for knights and kings
+        on the leaper squares, pawns on the capture diagonals and sliders at
+        the end of each ray, without generating any moves.
+        """
+        pieces = self.pieces[color]
+        if KNIGHT_ATTACKS[sq] & pieces[KNIGHT] or KING_ATTACKS[sq] & pieces[KING]:
+            return True
+        # A pawn attacks sq from the squares an opposing pawn on sq would capture on
+        if PAWN_ATTACKS[color ^ 1][sq] & pieces[PAWN]:
+            return True
+        queens = pieces[QUEEN]
+        occupied = self.occupied
+        return bool(bishop_attacks(sq, occupied) & (pieces[BISHOP] | queens) or
+                    rook_attacks(sq, occupied) & (pieces[ROOK] | queens))
@@ -0,0 +1,116 @@
+"""Fixed-size binary position records.
+
+Every position packs into RECORD_SIZE (32) bytes, little-endian:
+
+    bytes 0-7    occupancy mask, bit n set when square n holds a piece
+    bytes 8-23   one nibble per occupied square in square order, low nibble
+                 first: color << 3 | piece_type
+    byte 24      bit 0 set when black is to move, bits 4-7 the castling rights
+    byte 25      halfmove clock (capped at 255)
+    bytes 26-27  reserved (zero)
+    bytes 28-31  ply number (Board.ply)
+
+Without promotion a side never has more than 16 pieces, so 32 nibbles always
+suffice.  Records are laid end to end in bytes, bytearray or memoryview
+buffers; the bulk functions read and write them in place.
+"""
+import struct
+
+from bitboard import ROWS, COLS, SQUARE_COORDS, Position, iter_squares
+from rules import Board, Piece
+
+RECORD = struct.Struct('<Q16sBB2xI')
+RECORD_SIZE = RECORD.size
+MAX_PIECES = 32
+
+_BLACK_TO_MOVE = 1
+_CASTLING_SHIFT = 4
+_NO_PIECES = [0] * MAX_PIECES
+
+
+def encode_into(buffer, offset, board):
+    """Writes board's record into a writable buffer at offset."""
+    # The grid is already in square order, so codes come out in nibble order
+    codes = [piece.color << 3 | piece.piece_type for row in board.board for piece in row if piece]
+    if len(codes) > MAX_PIECES:
+        raise ValueError("too many pieces for a position record")
+    codes += _NO_PIECES[len(codes):]
+    nibbles = bytes(low | high << 4 for low, high in zip(codes[0::2], codes[1::2]))
+    position = board.position
+    flags = (0 if board.white_to_move else _BLACK_TO_MOVE) | position.castling_rights << _CASTLING_SHIFT
+    RECORD.pack_into(buffer, offset, position.occupied, nibbles, flags, min(board.halfmove_clock, 255), board.ply)
+
+
+def encode_board(board):
+    """Returns board's position as a RECORD_SIZE-byte record."""
+    record = bytearray(RECORD_SIZE)
+    encode_into(record, 0, board)
+    return bytes(record)
+
+
+def encode_boards(boards):
+    """Returns the records of all boards, end to end, in one bytearray."""
+    buffer = bytearray(RECORD_SIZE * len(boards))
+    for index, board in enumerate(boards):
+        encode_into(buffer, index * RECORD_SIZE, board)
+    return buffer
+
+
+def _unpack(buffer, offset):
+    """Returns (occupied, piece codes in square order, flags, halfmove clock, ply) for the record at offset."""
+    occupied, nibbles, flags, halfmove_clock, ply = RECORD.unpack_from(buffer, offset)
+    codes = [0] * MAX_PIECES
+    codes[0::2] = [byte & 0xF for byte in nibbles]
+    codes[1::2] = [byte >> 4 for byte in nibbles]
+    return occupied, codes, flags, halfmove_clock, ply
+
+
+def decode_position(buffer, offset=0):
+    """Returns (position, white_to_move, ply) for the record at offset, building
+    only the bitboards, not Board and Piece objects."""
+    occupied, codes, flags, _, ply = _unpack(buffer, offset)
+    position = Position()
+    masks = [0] * 16  # Indexed by piece code
+    for sq, code in zip(iter_squares(occupied), codes):
+        masks[code] |= 1 << sq
+    position.pieces = [masks[0:6], masks[8:14]]
+    position.occupancy = [sum(masks[0:6]), sum(masks[8:14])]
+    position.occupied = occupied
+    position.castling_rights = flags >> _CASTLING_SHIFT
+    return position, not flags & _BLACK_TO_MOVE, ply
+
+
+def decode_board(buffer, offset=0, board_class=Board):
+    """Returns a new board_class (rules.Board or a subclass) for the record at offset."""
+    occupied, codes, flags, halfmove_clock, ply = _unpack(buffer, offset)
+    grid = [[None for _ in range(COLS)] for _ in range(ROWS)]
+    for sq, code in zip(iter_squares(occupied), codes):
+        row, col = SQUARE_COORDS[sq]
+        grid[row][col] = Piece(code >> 3, code & 7, row, col)
+    board = board_class.__new__(board_class)
+    board.set_position(grid, not flags & _BLACK_TO_MOVE, flags >> _CASTLING_SHIFT, ply, halfmove_clock)
+    return board
+
+
+def record_count(buffer):
+    """Returns the number of whole records in buffer."""
+    return len(buffer) // RECORD_SIZE
+
+
+def iter_positions(buffer):
+    """Yields decode_position() for every record in buffer, reading it in place."""
+    view = memoryview(buffer)
+    for offset in range(0, record_count(view) * RECORD_SIZE, RECORD_SIZE):
+        yield decode_position(view, offset)
+
+
+def append_record(path, board):
+    """Appends board's record to a position store file."""
+    with open(path, 'ab') as store:
+        store.write(encode_board(board))
+
+
+def read_store(path):
+    """Returns the contents of a position store file, for the bulk readers."""
+    with open(path, 'rb') as store:
+        return store.read()
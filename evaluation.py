@@ -0,0 +1,139 @@
+"""Material and piece-square-table evaluation, updated incrementally.
+
+Every (color, piece type, square) is worth a fixed middlegame and endgame
+score: the piece's value plus a bonus from its piece-square table, positive
+for white and negative for black.  A position's middlegame and endgame scores
+are the sums over its pieces, and the game phase is the sum of the phase
+weights of the pieces left.  A move changes only a handful of terms, so Board
+keeps the sums up to date in make_move and restores them in unmake_move,
+exactly as it does with the Zobrist key, and evaluating a position is O(1).
+
+The final score blends the two by phase: all middlegame with the full set of
+minor and major pieces on the board, all endgame with none of them left.
+"""
+from bitboard import COLORS, PIECE_TYPES, SQUARES, WHITE, iter_squares
+
+# --- Piece values in centipawns, per piece type ---
+MG_VALUES = (100, 320, 330, 500, 900, 0)
+EG_VALUES = (120, 290, 310, 540, 940, 0)
+PHASE_WEIGHTS = (0, 1, 1, 2, 4, 0)
+MAX_PHASE = 24  # The phase of the initial position
+
+# --- Piece-square tables ---
+# From white's point of view in square order, so the first line is the 8th rank
+_PAWN_MG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+_PAWN_EG = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+     80,  80,  80,  80,  80,  80,  80,  80,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     30,  30,  30,  30,  30,  30,  30,  30,
+     15,  15,  15,  15,  15,  15,  15,  15,
+      5,   5,   5,   5,   5,   5,   5,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+      0,   0,   0,   0,   0,   0,   0,   0,
+)
+_KNIGHT = (
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+)
+_BISHOP = (
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+)
+_ROOK = (
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+)
+_QUEEN = (
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+)
+_KING_MG = (
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+)
+_KING_EG = (
+    -50, -40, -30, -20, -20, -30, -40, -50,
+    -30, -20, -10,   0,   0, -10, -20, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  30,  40,  40,  30, -10, -30,
+    -30, -10,  20,  30,  30,  20, -10, -30,
+    -30, -30,   0,   0,   0,   0, -30, -30,
+    -50, -30, -30, -30, -30, -30, -30, -50,
+)
+_MG_TABLES = (_PAWN_MG, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING_MG)
+_EG_TABLES = (_PAWN_EG, _KNIGHT, _BISHOP, _ROOK, _QUEEN, _KING_EG)
+
+
+def _square_scores(values, tables):
+    """Returns [color][piece type][square] -> signed value plus table bonus.
+    Black reads white's tables with the ranks mirrored (sq ^ 56)."""
+    return tuple(
+        tuple(
+            tuple((values[piece_type] + tables[piece_type][sq if color == WHITE else sq ^ 56])
+                  * (1 if color == WHITE else -1) for sq in range(SQUARES))
+            for piece_type in PIECE_TYPES)
+        for color in COLORS)
+
+
+MG_SCORES = _square_scores(MG_VALUES, _MG_TABLES)
+EG_SCORES = _square_scores(EG_VALUES, _EG_TABLES)
+
+
+def score_position(position):
+    """Computes (middlegame score, endgame score, phase) of a position from scratch."""
+    mg_score = eg_score = phase = 0
+    for color in COLORS:
+        for piece_type, mask in enumerate(position.pieces[color]):
+            mg_scores, eg_scores = MG_SCORES[color][piece_type], EG_SCORES[color][piece_type]
+            for sq in iter_squares(mask):
+                mg_score += mg_scores[sq]
+                eg_score += eg_scores[sq]
+                phase += PHASE_WEIGHTS[piece_type]
+    return mg_score, eg_score, phase
+
+
+def tapered(mg_score, eg_score, phase):
+    """Blends the middlegame and endgame scores by phase, in centipawns for white."""
+    phase = min(phase, MAX_PHASE)
+    return (mg_score * phase + eg_score * (MAX_PHASE - phase)) // MAX_PHASE
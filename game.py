@@ -1,14 +1,23 @@
 import pygame
 import sys
-import random
 import argparse
+import concurrent.futures
 import os
 
+import encoding
+import rules
+from rules import ROWS, COLS, COLOR_NAMES, PIECE_NAMES, AIPlayer
+from search import SearchAIPlayer
+
 # --- Constants ---
 WIDTH, HEIGHT = 800, 800
-ROWS, COLS = 8, 8
 SQUARE_SIZE = WIDTH // COLS
 FPS = 60
+MAX_PLIES = 1000  # Default cap on game length before a draw is adjudicated
+SEARCH_WAIT = 0.005  # Seconds per frame spent waiting for an AI move before drawing anyway
+
+# --- Exit codes (zero-player mode) ---
+WHITE_WINS_EXIT_CODE, BLACK_WINS_EXIT_CODE, DRAW_EXIT_CODE = 1, 2, 3
 
 # --- Colors ---
 WHITE = (240, 217, 181)
@@ -40,312 +49,83 @@ PIECES = {
 }
 
 
-class Piece:
-    def __init__(self, color, piece_type, row, col):
-        self.color = color
-        self.piece_type = piece_type
-        self.row = row
-        self.col = col
-        self.image = self.create_piece_image()  # Create image
-        self.rect = self.image.get_rect() #Creates a rect for piece.
-        self.update_rect() #Updates Rect
-        self.moved = False # Bool that indicates if the Piece has been moved before.
-
-    def __repr__(self):
-        return f"{self.color[0].upper()}{self.piece_type[0].upper()} ({self.row}, {self.col})"
-
-    def update_rect(self):
-        self.rect.topleft = (self.col * SQUARE_SIZE, self.row * SQUARE_SIZE)
-
-    def move(self, row, col):
-        self.row = row
-        self.col = col
-        self.update_rect()
-        self.moved = True
-
-    def get_valid_moves(self, board):
-        """Returns a list of valid move coordinates (row, col) for this piece,
-        considering the board state."""
-        moves = []
-        if self.piece_type == 'pawn':
-            moves = self.get_pawn_moves(board)
-        elif self.piece_type == 'rook':
-            moves = self.get_rook_moves(board)
-        elif self.piece_type == 'knight':
-            moves = self.get_knight_moves(board)
-        elif self.piece_type == 'bishop':
-            moves = self.get_bishop_moves(board)
-        elif self.piece_type == 'queen':
-            moves = self.get_queen_moves(board)
-        elif self.piece_type == 'king':
-            moves = self.get_king_moves(board)
-        return moves
-    def create_piece_image(self):
-        """Generates a simple graphical representation of the piece."""
-        image = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)  # Transparent background
-        color = PIECE_COLORS[self.color]
-        pygame.draw.circle(image, color, (SQUARE_SIZE // 2, SQUARE_SIZE // 2), SQUARE_SIZE // 3)  # Circle
-        font = pygame.font.Font(None, 36)
-        text_surface = font.render(self.piece_type[0].upper(), True, (255-color[0], 255-color[1], 255-color[2]))  # Opposite color for text
-        text_rect = text_surface.get_rect(center=(SQUARE_SIZE // 2, SQUARE_SIZE // 2))
-        image.blit(text_surface, text_rect)
-        return image
-
-
-    def get_pawn_moves(self, board):
-        moves = []
-        direction = -1 if self.color == 'white' else 1 # Reversed Directions
-        start_row = 6 if self.color == 'white' else 1
-
-        # Move one square forward
-        new_row = self.row + direction
-        if 0 <= new_row < ROWS and board[new_row][self.col] is None:
-            moves.append((new_row, self.col))
-
-            # Move two squares forward from starting position
-            if self.row == start_row and not self.moved and 0 <= new_row < ROWS and board[new_row][self.col] is None and 0 <= new_row + direction < ROWS and board[new_row + direction][self.col] is None:
-                moves.append((new_row + direction, self.col))
-
-        # Capture diagonally
-        new_row = self.row + direction
-        for col_offset in [-1, 1]:
-            new_col = self.col + col_offset
-            if 0 <= new_col < COLS and 0 <= new_row < ROWS: #Added row check.
-                piece = board[new_row][new_col]
-                if piece is not None and piece.color != self.color:
-                    moves.append((new_row, new_col))
-
-        return moves
-
-    def get_rook_moves(self, board):
-        moves = []
-        # Directions: up, down, left, right
-        directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dr, dc in directions:
-            for i in range(1, ROWS):
-                new_row, new_col = self.row + dr * i, self.col + dc * i
-                if 0 <= new_row < ROWS and 0 <= new_col < COLS:
-                    piece = board[new_row][new_col]
-                    if piece is None:
-                        moves.append((new_row, new_col))
-                    elif piece.color != self.color:
-                        moves.append((new_row, new_col))
-                        break  # Stop after capturing
-                    else:
-                        break  # Blocked by own piece
-                else:
-                    break  # Out of bounds
-        return moves
-
-    def get_knight_moves(self, board):
-        moves = []
-        knight_moves = [
-            (-2, -1), (-2, 1), (-1, -2), (-1, 2),
-            (1, -2), (1, 2), (2, -1), (2, 1)
-        ]
-        for dr, dc in knight_moves:
-            new_row, new_col = self.row + dr, self.col + dc
-            if 0 <= new_row < ROWS and 0 <= new_col < COLS:
-                piece = board[new_row][new_col]
-                if piece is None or piece.color != self.color:
-                    moves.append((new_row, new_col))
-        return moves
-
-    def get_bishop_moves(self, board):
-        moves = []
-        # Directions: up-left, up-right, down-left, down-right
-        directions = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        for dr, dc in directions:
-            for i in range(1, ROWS):
-                new_row, new_col = self.row + dr * i, self.col + dc * i
-                if 0 <= new_row < ROWS and 0 <= new_col < COLS:
-                    piece = board[new_row][new_col]
-                    if piece is None:
-                        moves.append((new_row, new_col))
-                    elif piece.color != self.color:
-                        moves.append((new_row, new_col))
-                        break
-                    else:
-                        break
-                else:
-                    break
-        return moves
-
-    def get_queen_moves(self, board):
-        # Queen moves are a combination of rook and bishop moves
-        return self.get_rook_moves(board) + self.get_bishop_moves(board)
-
-    def get_king_moves(self, board):
-        moves = []
-        king_moves = [
-            (-1, -1), (-1, 0), (-1, 1),
-            (0, -1), (0, 1),
-            (1, -1), (1, 0), (1, 1)
-        ]
-        for dr, dc in king_moves:
-            new_row, new_col = self.row + dr, self.col + dc
-            if 0 <= new_row < ROWS and 0 <= new_col < COLS:
-                piece = board[new_row][new_col]
-                if piece is None or piece.color != self.color:
-                    moves.append((new_row, new_col))
-        return moves
-
-
-class Board:
-    def __init__(self):
-        self.board = [[None for _ in range(COLS)] for _ in range(ROWS)] # Represents the board
-        self.setup_board()
-        self.white_to_move = True
-
-    def setup_board(self):
-        # White pieces
-        self.board[7][0] = Piece('white', 'rook', 7, 0)
-        self.board[7][1] = Piece('white', 'knight', 7, 1)
-        self.board[7][2] = Piece('white', 'bishop', 7, 2)
-        self.board[7][3] = Piece('white', 'queen', 7, 3)
-        self.board[7][4] = Piece('white', 'king', 7, 4)
-        self.board[7][5] = Piece('white', 'bishop', 7, 5)
-        self.board[7][6] = Piece('white', 'knight', 7, 6)
-        self.board[7][7] = Piece('white', 'rook', 7, 7)
-        for i in range(COLS):
-            self.board[6][i] = Piece('white', 'pawn', 6, i)
-
-        # Black pieces
-        self.board[0][0] = Piece('black', 'rook', 0, 0)
-        self.board[0][1] = Piece('black', 'knight', 0, 1)
-        self.board[0][2] = Piece('black', 'bishop', 0, 2)
-        self.board[0][3] = Piece('black', 'queen', 0, 3)
-        self.board[0][4] = Piece('black', 'king', 0, 4)
-        self.board[0][5] = Piece('black', 'bishop', 0, 5)
-        self.board[0][6] = Piece('black', 'knight', 0, 6)
-        self.board[0][7] = Piece('black', 'rook', 0, 7)
-        for i in range(COLS):
-            self.board[1][i] = Piece('black', 'pawn', 1, i)
+def create_piece_image(color, piece_type):
+    """Generates a simple graphical representation of a piece, given its color and type codes."""
+    image = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)  # Transparent background
+    color = PIECE_COLORS[COLOR_NAMES[color]]
+    pygame.draw.circle(image, color, (SQUARE_SIZE // 2, SQUARE_SIZE // 2), SQUARE_SIZE // 3)  # Circle
+    font = pygame.font.Font(None, 36)
+    text_surface = font.render(PIECE_NAMES[piece_type][0].upper(), True, (255-color[0], 255-color[1], 255-color[2]))  # Opposite color for text
+    text_rect = text_surface.get_rect(center=(SQUARE_SIZE // 2, SQUARE_SIZE // 2))
+    image.blit(text_surface, text_rect)
+    return image
 
-    def draw(self, screen):
-        for row in range(ROWS):
-            for col in range(COLS):
-                color = WHITE if (row + col) % 2 == 0 else BLACK
-                pygame.draw.rect(screen, color, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
-                piece = self.board[row][col]
-                if piece:
-                    screen.blit(piece.image, piece.rect)
+_piece_images = {}  # (color, piece_type) -> Surface, filled on first draw
 
-    def move_piece(self, start_row, start_col, end_row, end_col):
-        """Moves a piece from start_row, start_col to end_row, end_col."""
 
-        piece = self.board[start_row][start_col]
-        if piece:
-            # Update the board
-            self.board[end_row][end_col] = piece
-            self.board[start_row][start_col] = None  # Clear the old position
+def get_piece_image(piece):
+    """Returns the shared sprite for the piece's color and type."""
+    key = (piece.color, piece.piece_type)
+    image = _piece_images.get(key)
+    if image is None:
+        image = _piece_images[key] = create_piece_image(piece.color, piece.piece_type)
+    return image
 
-            # Update the piece's position
-            piece.move(end_row, end_col)
 
-            # Switch turns
-            self.white_to_move = not self.white_to_move
-            return True
-        return False
-
-    def is_valid_move(self, start_row, start_col, end_row, end_col):
-        """Checks if a move is valid based on the piece's movement rules and board state."""
-        piece = self.board[start_row][start_col]
-        if not piece:
-            return False
-
-        # Check turn
-        if (piece.color == 'white' and not self.white_to_move) or \
-           (piece.color == 'black' and self.white_to_move):
-            return False
-
-        # Check if the destination is within the valid moves for the piece
-        valid_moves = piece.get_valid_moves(self.board)
-        if (end_row, end_col) not in valid_moves:
-            return False
-
-        return True
-
-    def get_piece(self, row, col):
-        """Returns the piece at the specified row and column, or None if the square is empty."""
-        if 0 <= row < ROWS and 0 <= col < COLS:
-            return self.board[row][col]
-        return None
-
-    def check_win_condition(self):
-        """Checks if any win conditions are met and returns the winning color or None"""
-        white_king_alive = False
-        black_king_alive = False
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece:
-                    if piece.color == 'white' and piece.piece_type == 'king':
-                        white_king_alive = True
-                    if piece.color == 'black' and piece.piece_type == 'king':
-                        black_king_alive = True
-
-        if not white_king_alive:
-            return 'black'
-        if not black_king_alive:
-            return 'white'
-        return None # None if no win condition
-
-    def is_game_over(self):
-        """Returns True if the game is over (checkmate or stalemate), False otherwise."""
-        return self.check_win_condition() is not None
-
-    def get_all_pieces(self, color):
-        """Returns a list of all pieces of a given color on the board."""
-        pieces = []
-        for row in range(ROWS):
-            for col in range(COLS):
-                piece = self.board[row][col]
-                if piece and piece.color == color:
-                    pieces.append(piece)
-        return pieces
+def get_square_rect(row, col):
+    """Returns the screen rect covering the given board square."""
+    return pygame.Rect(col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE)
 
-class AIPlayer:
-    def __init__(self, color):
-        self.color = color
 
-    def get_best_move(self, board):
-        """Returns the best move for the AI player based on a simple evaluation."""
-        possible_moves = self.get_all_possible_moves(board)
-        if not possible_moves:
-            return None
+class Board(rules.Board):
+    """A rules board that knows how to draw itself with pygame."""
 
-        # Simple evaluation: choose a random valid move
-        return random.choice(possible_moves)
+    def draw(self, screen):
+        for row in range(ROWS):
+            for col in range(COLS):
+                color = WHITE if (row + col) % 2 == 0 else BLACK
+                pygame.draw.rect(screen, color, (col * SQUARE_SIZE, row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
-    def get_all_possible_moves(self, board):
-        """Returns a list of all possible moves for the AI player."""
-        pieces = board.get_all_pieces(self.color)
-        possible_moves = []
-        for piece in pieces:
-            valid_moves = piece.get_valid_moves(board.board)
-            for move in valid_moves:
-                possible_moves.append((piece.row, piece.col, move[0], move[1])) # start_row, start_col, end_row, end_col
-        return possible_moves
+                piece = self.board[row][col]
+                if piece:
+                    screen.blit(get_piece_image(piece), (col * SQUARE_SIZE, row * SQUARE_SIZE))
 
 
 class Game:
-    def __init__(self, screen, num_players):
+    def __init__(self, screen, num_players, max_plies=None, adjudicate_draws=True, depth=None,
+                 movetime=None, game_time=None, insufficient_material=False):
+        """max_plies caps the game length; adjudicate_draws enables the fifty-move
+        and threefold repetition draws, insufficient_material the standard-chess
+        dead-position draw (kings can still be captured there).  With a depth, a
+        movetime (ms per move) or a game_time (ms per side) the AI searches ahead
+        instead of moving at random."""
         self.screen = screen
         self.board = Board()
         self.selected_piece = None
         self.possible_moves = []
         pygame.font.init()
         self.num_players = num_players
-        self.ai_player_white = AIPlayer('white') if num_players == 0 else None
-        self.ai_player_black = AIPlayer('black') if num_players in [0, 1] else None  # AI plays as black or both
+        if depth is None and movetime is None and game_time is None:
+            make_player = AIPlayer
+        else:
+            make_player = lambda color: SearchAIPlayer(color, depth, movetime, game_time)
+        self.ai_player_white = make_player(rules.WHITE) if num_players == 0 else None
+        self.ai_player_black = make_player(rules.BLACK) if num_players in [0, 1] else None  # AI plays as black or both
+        # AI moves are chosen on a worker thread, on a copy of the board, so a long search doesn't freeze the window
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.pending_move = None # Future for the AI move being chosen
         self.game_over = False
+        self.max_plies = max_plies
+        self.adjudicate_draws = adjudicate_draws
+        self.insufficient_material = insufficient_material
+        self.draw_reason = None # Why the game was drawn, once it has been
 
 
     def handle_input(self, event):
         """Handles user input events (mouse clicks)."""
-        if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and self.num_players > 0:
+        if (event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and self.num_players > 0 and
+                self.get_ai_to_move() is None):
             mouse_row = event.pos[1] // SQUARE_SIZE
             mouse_col = event.pos[0] // SQUARE_SIZE
 
@@ -355,32 +135,37 @@ class Game:
                     if self.board.move_piece(self.selected_piece.row, self.selected_piece.col, mouse_row, mouse_col):
                         self.selected_piece = None
                         self.possible_moves = [] # Clear Possible Moves after Piece Selection
-                        if self.num_players == 1 and not self.board.white_to_move and not self.game_over:
-                            self.ai_move() # Trigger AI Move if required.
                 else:
                     # Deselect the piece if the click is not a valid move
                     self.selected_piece = None
                     self.possible_moves = [] # Clear Possible Moves after Piece Selection
                     # Optionally, try selecting a new piece at the clicked square
                     piece = self.board.get_piece(mouse_row, mouse_col)
-                    if piece and ((piece.color == 'white' and self.board.white_to_move) or (piece.color == 'black' and not self.board.white_to_move)):
+                    if piece and piece.color == self.board.side_to_move:
                         self.selected_piece = piece
-                        self.possible_moves = piece.get_valid_moves(self.board.board)
+                        self.possible_moves = piece.get_valid_moves(self.board.position)
             else:
                 # Select a piece
                 piece = self.board.get_piece(mouse_row, mouse_col)
-                if piece and ((piece.color == 'white' and self.board.white_to_move) or (piece.color == 'black' and not self.board.white_to_move)):
+                if piece and piece.color == self.board.side_to_move:
                     self.selected_piece = piece
-                    self.possible_moves = piece.get_valid_moves(self.board.board)
+                    self.possible_moves = piece.get_valid_moves(self.board.position)
 
     def update(self):
         """Updates the game state."""
         # Check for game over (win condition)
-        winner = self.board.check_win_condition()
-        if winner:
-            print(f"{winner.capitalize()} wins!")
+        winner = self.board.outcome
+        if winner is not None:
+            print(f"{COLOR_NAMES[winner].capitalize()} wins!")
             self.game_over = True
             return True  # Game is over
+        adjudicate = self.adjudicate_draws
+        reason = self.board.get_draw_reason(self.max_plies, adjudicate, adjudicate, self.insufficient_material)
+        if reason is not None:
+            print(f"Draw by {reason}.")
+            self.draw_reason = reason
+            self.game_over = True
+            return True
         return False # Game is not over
 
     def draw(self):
@@ -394,39 +179,55 @@ class Game:
                 s.set_alpha(128)  # Transparency value (0-255)
                 s.fill(POSSIBLE_MOVE)
                 self.screen.blit(s, (col * SQUARE_SIZE, row * SQUARE_SIZE))
-            pygame.draw.rect(self.screen, HIGHLIGHT, self.selected_piece.rect, 3)  # Highlight Thickness of 3 Pixels.
+            pygame.draw.rect(self.screen, HIGHLIGHT, get_square_rect(self.selected_piece.row, self.selected_piece.col), 3)  # Highlight Thickness of 3 Pixels.
         if self.game_over:
             self.draw_game_over()
 
+    def stop_ai(self):
+        """Stops any AI search still running and waits for its thread to finish."""
+        for ai_player in (self.ai_player_white, self.ai_player_black):
+            if isinstance(ai_player, SearchAIPlayer):
+                ai_player.stop()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_ai_to_move(self):
+        """Returns the AI player whose turn it is, or None if a human (or nobody) is to move."""
+        return self.ai_player_white if self.board.white_to_move else self.ai_player_black
+
     def ai_move(self):
-        """Executes a move for the AI player."""
+        """Executes a move for the AI player, once its worker has chosen one.
+        Called every frame; returns straight away while the search is still running."""
         if not self.game_over:
-            if self.num_players == 0: # 0 Player, both AIs play
-                if self.board.white_to_move:
-                    ai_player = self.ai_player_white
-                else:
-                    ai_player = self.ai_player_black
-            elif self.num_players == 1:  # 1 Player, Black AI plays
-                ai_player = self.ai_player_black
-            else:
-                return  # No AI in 2-player mode
-
+            ai_player = self.get_ai_to_move()
             if ai_player:
-                move = ai_player.get_best_move(self.board)
-                if move:
-                    start_row, start_col, end_row, end_col = move
-                    if self.board.move_piece(start_row, start_col, end_row, end_col):
-                        print(f"AI ({ai_player.color}) made a move.")
+                if self.pending_move is None:
+                    snapshot = encoding.decode_board(encoding.encode_board(self.board))
+                    if isinstance(ai_player, SearchAIPlayer):
+                        ai_player.resume()  # Here rather than in the search, so stop_ai() can't be undone
+                    self.pending_move = self.executor.submit(ai_player.get_best_move, snapshot)
+                done, _ = concurrent.futures.wait([self.pending_move], timeout=SEARCH_WAIT)
+                if not done:
+                    return
+                move = self.pending_move.result()
+                self.pending_move = None
+                if move is not None:
+                    if self.board.make_move(move):
+                        print(f"AI ({COLOR_NAMES[ai_player.color]}) made a move.")
                         self.update() #Check For Game Over.
                 else:
                     print("AI has no possible moves.")
+                    self.draw_reason = "no moves" # Nobody captured a king, so it counts as a draw
                     self.game_over = True # end the game because ai can't move
 
     def draw_game_over(self):
         """Draws the game over screen."""
-        winner = self.board.check_win_condition()
+        winner = self.board.outcome
         font = pygame.font.Font(None, 60)
-        text = font.render(f"{winner.capitalize()} wins!", True, TEXT_COLOR)
+        if winner is not None:
+            message = f"{COLOR_NAMES[winner].capitalize()} wins!"
+        else:
+            message = f"Draw ({self.draw_reason})"
+        text = font.render(message, True, TEXT_COLOR)
         text_rect = text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
         self.screen.blit(text, text_rect)
 
@@ -518,7 +319,17 @@ def main():
     parser.add_argument("--zero-player", action="store_true", help="Run the game in 0-player mode (AI vs AI)")
     parser.add_argument("--x", type=int, default=None, help="X position of the window")
     parser.add_argument("--y", type=int, default=None, help="Y position of the window")
+    parser.add_argument("--depth", type=int, default=None, help="Let the AI search this many plies ahead (default: random moves)")
+    parser.add_argument("--movetime", type=int, default=None, help="Let the AI search for this many milliseconds per move")
+    parser.add_argument("--game-time", type=float, default=None, help="Give each searching AI this many seconds for the whole game")
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES, help="Adjudicate a draw after this many plies (0 for no limit)")
+    parser.add_argument("--no-draw-rules", action="store_true", help="Turn off the fifty-move and repetition draws")
+    parser.add_argument("--insufficient-material", action="store_true",
+                        help="Draw positions that would be dead in standard chess (off by default: kings can still be captured)")
+    parser.add_argument("--result-file", default=None, help="Append the final position record (see encoding.py) to this file")
     args = parser.parse_args()
+    if args.depth is not None and args.depth < 1:
+        parser.error("--depth must be at least 1")
 
 
     pygame.init()
@@ -532,8 +343,12 @@ def main():
     clock = pygame.time.Clock()
     pygame.font.init() #Initialize Font
 
+    game_settings = {"max_plies": args.max_plies or None, "adjudicate_draws": not args.no_draw_rules,
+                     "insufficient_material": args.insufficient_material,
+                     "depth": args.depth, "movetime": args.movetime,
+                     "game_time": None if args.game_time is None else args.game_time * 1000}
     if args.zero_player:
-        game = Game(screen, 0)  # Initialize game directly in 0-player mode
+        game = Game(screen, 0, **game_settings)  # Initialize game directly in 0-player mode
         in_title_screen = False
     else:
         # Title Screen Setup
@@ -553,7 +368,7 @@ def main():
             if in_title_screen:
                 title_screen.handle_input(event)
                 if title_screen.start_game:
-                    game = Game(screen, title_screen.num_players)
+                    game = Game(screen, title_screen.num_players, **game_settings)
                     in_title_screen = False
             elif game:
                 game.handle_input(event)
@@ -566,6 +381,8 @@ def main():
                     game.ai_move()
                 else:
                     game.update()
+                    if not game.game_over:
+                        game.ai_move() # The AI answers in 1 player mode
 
 
             game.draw()
@@ -577,13 +394,19 @@ def main():
             running = False
 
 
+    if game:
+        game.stop_ai()
     pygame.quit()
     if args.zero_player:
-         winner = game.board.check_win_condition()
-         if winner == 'white':
-             sys.exit(1)
-         elif winner == 'black':
-             sys.exit(2)
+         if args.result_file:
+             encoding.append_record(args.result_file, game.board)
+         winner = game.board.outcome
+         if winner == rules.WHITE:
+             sys.exit(WHITE_WINS_EXIT_CODE)
+         elif winner == rules.BLACK:
+             sys.exit(BLACK_WINS_EXIT_CODE)
+         elif game.draw_reason is not None:
+             sys.exit(DRAW_EXIT_CODE)
     sys.exit()
 
 if __name__ == "__main__":
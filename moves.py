@@ -0,0 +1,40 @@
+"""Packed integer move encoding.
+
+A move is a 16-bit int: bits 0-5 hold the start square, bits 6-11 the end
+square (both numbered as in bitboard.py) and bits 12-15 carry flags.  Move
+lists are array('H') buffers of these ints, so generators append plain
+integers instead of building coordinate tuples.
+"""
+from array import array
+
+from bitboard import square, square_name
+
+# --- Flags ---
+CAPTURE = 1 << 12
+CASTLE = 1 << 13
+PROMOTION = 1 << 14  # Reserved: the rules have no pawn promotion yet
+
+# Generators and the search unpack moves inline: move & SQUARE_MASK is the start
+# square, move >> END_SHIFT & SQUARE_MASK the end square
+SQUARE_MASK = 0x3F
+END_SHIFT = 6
+
+
+def encode_coords(start_row, start_col, end_row, end_col, flags=0):
+    """Packs a move given as board coordinates."""
+    return square(start_row, start_col) | square(end_row, end_col) << END_SHIFT | flags
+
+
+def move_name(move):
+    """Returns coordinate notation for a packed move, e.g. 'e2e4'."""
+    return square_name(move & SQUARE_MASK) + square_name(move >> END_SHIFT & SQUARE_MASK)
+
+
+class MoveList(array):
+    """A compact list of packed moves backed by an unsigned 16-bit array."""
+
+    def __new__(cls, moves=()):
+        return super().__new__(cls, 'H', moves)
+
+    def __repr__(self):
+        return f"MoveList([{', '.join(move_name(move) for move in self)}])"
@@ -0,0 +1,128 @@
+"""Perft: counts the leaf nodes of the move tree to a fixed depth.
+
+The counts check the move generator against known-good numbers, and the
+timing shows how fast AIPlayer.get_all_possible_moves runs.  Moves follow
+this game's rules: pseudo-legal moves with castling, no promotion or en
+passant, and a position where a king has been captured is terminal.
+
+    python perft.py --depth 4
+    python perft.py --moves e2e4 e7e5 --depth 3 --divide
+    python perft.py --fen "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1" --depth 3
+    python perft.py --suite
+"""
+import argparse
+import sys
+import time
+
+from bitboard import SQUARE_COORDS, parse_square
+from moves import move_name
+from rules import START_FEN, WHITE, BLACK, AIPlayer, Board
+
+# (name, FEN, {depth: expected leaf nodes})
+REFERENCE_POSITIONS = [
+    ("start", START_FEN, {1: 20, 2: 400, 3: 8902, 4: 197742}),
+    ("italian", "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4", {1: 33, 2: 958, 3: 31629}),
+    ("queens-gambit", "r3kbnr/pppqpppp/2n5/3p1b2/3P1B2/2N5/PPPQPPPP/R3KBNR w KQkq - 0 5", {1: 35, 2: 1220, 3: 43590}),
+    ("exposed-king", "rnbqkbnr/ppppp1pp/8/5p1Q/4P3/8/PPPP1PPP/RNB1KBNR b KQkq - 0 2", {1: 20, 2: 819, 3: 17814}),
+]
+
+_players = {True: AIPlayer(WHITE), False: AIPlayer(BLACK)}
+
+
+def perft(board, depth):
+    """Returns the number of positions reachable from board in exactly depth moves."""
+    if depth == 0:
+        return 1
+    if board.outcome is not None:
+        return 0
+    moves = _players[board.white_to_move].get_all_possible_moves(board)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """Returns {move name: leaf nodes below that move} for every move at the root."""
+    counts = {}
+    for move in _players[board.white_to_move].get_all_possible_moves(board):
+        board.make_move(move)
+        counts[move_name(move)] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def board_after(moves, fen=START_FEN):
+    """Returns a new Board set up from fen with the given coordinate-notation moves played."""
+    board = Board(fen)
+    for name in moves:
+        start_row, start_col = SQUARE_COORDS[parse_square(name[:2])]
+        end_row, end_col = SQUARE_COORDS[parse_square(name[2:4])]
+        if not board.is_valid_move(start_row, start_col, end_row, end_col):
+            raise ValueError(f"illegal move: {name}")
+        board.move_piece(start_row, start_col, end_row, end_col)
+    return board
+
+
+def run_suite(max_depth=None):
+    """Runs every reference position and returns True if all counts match."""
+    ok = True
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, expected in REFERENCE_POSITIONS:
+        for depth, count in sorted(expected.items()):
+            if max_depth is not None and depth > max_depth:
+                continue
+            board = Board(fen)
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+            total_nodes += nodes
+            total_time += elapsed
+            status = "ok" if nodes == count else f"FAIL (expected {count})"
+            ok = ok and nodes == count
+            print(f"{name:<16} depth {depth}: {nodes:>8} {status}  {_rate(nodes, elapsed)}")
+    print(f"Total: {total_nodes} nodes, {_rate(total_nodes, total_time)}")
+    return ok
+
+
+def _rate(nodes, elapsed):
+    return f"{nodes / elapsed:,.0f} nodes/s" if elapsed > 0 else "- nodes/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count move-tree leaf nodes (perft)")
+    parser.add_argument("--depth", type=int, default=None, help="Search depth in plies (default 3; caps the suite depth)")
+    parser.add_argument("--fen", default=START_FEN, help="Position to start from (default: the initial position)")
+    parser.add_argument("--moves", nargs="*", default=[], help="Moves played from that position first, e.g. e2e4 e7e5")
+    parser.add_argument("--divide", action="store_true", help="Print the node count below each root move")
+    parser.add_argument("--suite", action="store_true", help="Run the reference positions and check their counts")
+    args = parser.parse_args()
+    if args.depth is not None and args.depth < 0:
+        parser.error("--depth must not be negative")
+    if args.divide and args.depth == 0:
+        parser.error("--divide needs a depth of at least 1")
+
+    if args.suite:
+        sys.exit(0 if run_suite(args.depth) else 1)
+
+    depth = args.depth if args.depth is not None else 3
+    board = board_after(args.moves, args.fen)
+    start = time.perf_counter()
+    if args.divide:
+        counts = divide(board, depth)
+        for name, count in sorted(counts.items()):
+            print(f"{name}: {count}")
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, depth)
+    elapsed = time.perf_counter() - start
+    print(f"Nodes: {nodes}  Time: {elapsed:.3f}s  {_rate(nodes, elapsed)}")
+
+
+if __name__ == "__main__":
+    main()
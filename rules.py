@@ -0,0 +1,687 @@
+"""Chess rules without any pygame dependency.
+
+The board, pieces, move generation and win detection live here so that batch
+simulations can play games without initializing SDL or rendering sprites.
+game.py draws these objects on top as a view.
+"""
+import random
+
+from bitboard import (ROWS, COLS, SQUARES, SQUARE_COORDS, KING_ATTACKS, KNIGHT_ATTACKS, PAWN_ATTACKS, LIGHT_SQUARES,
+                      WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, COLOR_NAMES, PIECE_NAMES,
+                      Position, bishop_attacks, iter_squares, popcount, queen_attacks, rook_attacks, square)
+from moves import CAPTURE, CASTLE, END_SHIFT, SQUARE_MASK, MoveList, encode_coords
+from evaluation import EG_SCORES, MG_SCORES, PHASE_WEIGHTS, score_position
+from zobrist import BLACK_TO_MOVE_KEY, CASTLING_KEYS, PIECE_KEYS, hash_position
+
+# --- Castling rights bits ---
+WHITE_KINGSIDE, WHITE_QUEENSIDE, BLACK_KINGSIDE, BLACK_QUEENSIDE = 1, 2, 4, 8
+ALL_CASTLING_RIGHTS = WHITE_KINGSIDE | WHITE_QUEENSIDE | BLACK_KINGSIDE | BLACK_QUEENSIDE
+
+# right -> (color, row, rook column); the king always starts on column 4
+CASTLING_HOMES = {
+    WHITE_KINGSIDE: (WHITE, 7, 7),
+    WHITE_QUEENSIDE: (WHITE, 7, 0),
+    BLACK_KINGSIDE: (BLACK, 0, 7),
+    BLACK_QUEENSIDE: (BLACK, 0, 0),
+}
+
+
+def _castling_rights_kept():
+    """Per square, the rights that survive a move from or to that square."""
+    kept = [ALL_CASTLING_RIGHTS] * SQUARES
+    for right, (color, row, rook_col) in CASTLING_HOMES.items():
+        kept[square(row, 4)] &= ~right
+        kept[square(row, rook_col)] &= ~right
+    return tuple(kept)
+
+
+CASTLING_RIGHTS_KEPT = _castling_rights_kept()
+
+
+def _castling_paths():
+    """right -> (king column after castling, rook column after castling,
+    mask of squares that must be empty, squares the king must not be attacked on)."""
+    paths = {}
+    for right, (color, row, rook_col) in CASTLING_HOMES.items():
+        step = 1 if rook_col > 4 else -1
+        between = 0
+        for col in range(4 + step, rook_col, step):
+            between |= 1 << square(row, col)
+        safe = tuple(square(row, col) for col in (4, 4 + step, 4 + 2 * step))
+        paths[right] = (4 + 2 * step, 4 + step, between, safe)
+    return paths
+
+
+CASTLING_PATHS = _castling_paths()
+CASTLING_RIGHTS = ((WHITE_KINGSIDE, WHITE_QUEENSIDE), (BLACK_KINGSIDE, BLACK_QUEENSIDE))  # per color
+
+# --- FEN ---
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+FEN_PIECES = 'PNBRQK'  # Indexed by piece type; white is upper case, black lower case
+FEN_CASTLING = ((WHITE_KINGSIDE, 'K'), (WHITE_QUEENSIDE, 'Q'), (BLACK_KINGSIDE, 'k'), (BLACK_QUEENSIDE, 'q'))
+
+# --- Draw adjudication ---
+FIFTY_MOVE_PLIES = 100  # Plies without a capture or pawn move before the fifty-move rule applies
+REPETITION_COUNT = 3
+
+# Pawn geometry per color: white pawns start on row 6 and move towards row 0
+PAWN_START_ROWS = (6, 1)
+PAWN_STEPS = (-COLS, COLS)
+
+
+def _pawn_targets(position, sq, color):
+    occupied = position.occupied
+    # Capture diagonally
+    targets = PAWN_ATTACKS[color][sq] & position.occupancy[color ^ 1]
+
+    # Move one square forward
+    ahead = sq + PAWN_STEPS[color]
+    if 0 <= ahead < SQUARES and not occupied >> ahead & 1:
+        targets |= 1 << ahead
+
+        # Move two squares forward from the starting row (a pawn there has never moved)
+        if sq // COLS == PAWN_START_ROWS[color]:
+            ahead += PAWN_STEPS[color]
+            if not occupied >> ahead & 1:
+                targets |= 1 << ahead
+    return targets
+
+
+def _knight_targets(position, sq, color):
+    return KNIGHT_ATTACKS[sq] & ~position.occupancy[color]
+
+
+def _bishop_targets(position, sq, color):
+    return bishop_attacks(sq, position.occupied) & ~position.occupancy[color]
+
+
+def _rook_targets(position, sq, color):
+    return rook_attacks(sq, position.occupied) & ~position.occupancy[color]
+
+
+def _queen_targets(position, sq, color):
+    return queen_attacks(sq, position.occupied) & ~position.occupancy[color]
+
+
+def _king_targets(position, sq, color):
+    return KING_ATTACKS[sq] & ~position.occupancy[color]
+
+
+# piece type -> function(position, square, color) returning the mask of reachable squares (castling aside)
+TARGET_GENERATORS = (_pawn_targets, _knight_targets, _bishop_targets, _rook_targets, _queen_targets, _king_targets)
+
+
+# Attack masks for the capture-only generator: no pawn pushes, castling or empty-square tests
+def _pawn_attacks(occupied, sq, color):
+    return PAWN_ATTACKS[color][sq]
+
+
+def _knight_attacks(occupied, sq, color):
+    return KNIGHT_ATTACKS[sq]
+
+
+def _king_attacks(occupied, sq, color):
+    return KING_ATTACKS[sq]
+
+
+def _bishop_attacks(occupied, sq, color):
+    return bishop_attacks(sq, occupied)
+
+
+def _rook_attacks(occupied, sq, color):
+    return rook_attacks(sq, occupied)
+
+
+def _queen_attacks(occupied, sq, color):
+    return queen_attacks(sq, occupied)
+
+
+# piece type -> function(occupied, square, color) returning the mask of attacked squares
+ATTACK_GENERATORS = (_pawn_attacks, _knight_attacks, _bishop_attacks, _rook_attacks, _queen_attacks, _king_attacks)
+
+
+def _iter_moves(start, targets, flags):
+    """Yields a packed move from start to every square in targets."""
+    flags |= start
+    while targets:
+        low = targets & -targets
+        yield flags | (low.bit_length() - 1) << END_SHIFT
+        targets ^= low
+
+
+class Piece:
+    # No per-instance __dict__: a piece is just its identity, square and moved flag.
+    # Sprites belong to the view and are shared per (color, piece_type).
+    __slots__ = ('color', 'piece_type', 'row', 'col', 'moved')
+
+    def __init__(self, color, piece_type, row, col):
+        self.color = color
+        self.piece_type = piece_type
+        self.row = row
+        self.col = col
+        self.moved = False # Bool that indicates if the Piece has been moved before.
+
+    def __repr__(self):
+        return f"{COLOR_NAMES[self.color][0].upper()}{PIECE_NAMES[self.piece_type][0].upper()} ({self.row}, {self.col})"
+
+    def move(self, row, col):
+        self.row = row
+        self.col = col
+        self.moved = True
+
+    def get_valid_moves(self, position):
+        """Returns a list of valid move coordinates (row, col) for this piece,
+        considering the piece placement in the given bitboard Position."""
+        moves = [SQUARE_COORDS[sq] for sq in iter_squares(self.get_target_mask(position))]
+        if self.piece_type == KING:
+            moves.extend(SQUARE_COORDS[move >> END_SHIFT & SQUARE_MASK] for move in self._iter_castling_moves(position))
+        return moves
+
+    def get_target_mask(self, position):
+        """Returns a mask of the squares this piece can move to, leaving out castling."""
+        return TARGET_GENERATORS[self.piece_type](position, square(self.row, self.col), self.color)
+
+    def add_moves(self, position, moves):
+        """Appends this piece's moves to a MoveList as packed ints."""
+        start = self.row * COLS + self.col
+        targets = TARGET_GENERATORS[self.piece_type](position, start, self.color)
+        captures = targets & position.occupied
+        quiets = targets ^ captures
+        append = moves.append
+        flags = start | CAPTURE
+        while captures:
+            low = captures & -captures
+            append(flags | (low.bit_length() - 1) << END_SHIFT)
+            captures ^= low
+        while quiets:
+            low = quiets & -quiets
+            append(start | (low.bit_length() - 1) << END_SHIFT)
+            quiets ^= low
+        if self.piece_type == KING and position.castling_rights:
+            moves.extend(self._iter_castling_moves(position))
+
+    def iter_moves(self, position):
+        """Yields this piece's packed moves lazily: captures first, then quiet moves,
+        then castling, so callers that find what they need early skip the rest."""
+        start = square(self.row, self.col)
+        targets = self.get_target_mask(position)
+        yield from _iter_moves(start, targets & position.occupied, CAPTURE)
+        yield from _iter_moves(start, targets & ~position.occupied, 0)
+        if self.piece_type == KING:
+            yield from self._iter_castling_moves(position)
+
+    def _iter_castling_moves(self, position):
+        if position.castling_rights:
+            start = square(self.row, self.col)
+            for right in CASTLING_RIGHTS[self.color]:
+                if self.can_castle(position, right):
+                    yield start | square(self.row, CASTLING_PATHS[right][0]) << END_SHIFT | CASTLE
+
+    def can_castle(self, position, right):
+        """Checks whether this king may castle on the side given by a castling-rights bit:
+        the right is still held, the squares in between are empty and the king is not
+        in check and does not pass through or land on an attacked square."""
+        if not position.castling_rights & right:
+            return False
+        _, _, between, safe = CASTLING_PATHS[right]
+        if position.occupied & between:
+            return False
+        enemy = self.color ^ 1
+        for sq in safe:
+            if position.is_attacked(sq, enemy):
+                return False
+        return True
+
+
+class Board:
+    def __init__(self, fen=None):
+        """Sets up the starting position, or the position described by a FEN string."""
+        if fen is not None:
+            self.set_fen(fen)
+            return
+        self.board = [[None for _ in range(COLS)] for _ in range(ROWS)] # Represents the board
+        self.setup_board()
+        self.white_to_move = True
+        self.first_ply = 0 # Plies played before the first position, from the FEN move number
+        self.halfmove_clock = 0 # Plies since the last capture or pawn move
+        self.undo_stack = [] # One record per move made, popped by unmake_move
+        self.index_pieces()
+
+    def set_fen(self, fen):
+        """Replaces the position with the one described by a FEN string.
+        The rules have no en passant, so that field is ignored."""
+        fields = fen.split()
+        if not 2 <= len(fields) <= 6:
+            raise ValueError(f"invalid FEN: {fen!r}")
+        placement, side = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else '-'
+        halfmove = fields[4] if len(fields) > 4 else '0'
+        fullmove = fields[5] if len(fields) > 5 else '1'
+        ranks = placement.split('/')
+        if len(ranks) != ROWS or side not in ('w', 'b') or not (halfmove.isdigit() and fullmove.isdigit()):
+            raise ValueError(f"invalid FEN: {fen!r}")
+
+        board = [[None for _ in range(COLS)] for _ in range(ROWS)]
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                elif char.upper() in FEN_PIECES and col < COLS:
+                    color = WHITE if char.isupper() else BLACK
+                    board[row][col] = Piece(color, FEN_PIECES.index(char.upper()), row, col)
+                    col += 1
+                else:
+                    raise ValueError(f"invalid FEN: {fen!r}")
+            if col != COLS:
+                raise ValueError(f"invalid FEN: {fen!r}")
+
+        rights = 0
+        for right, letter in FEN_CASTLING:
+            if letter in castling:
+                rights |= right
+        white_to_move = side == 'w'
+        self.set_position(board, white_to_move, rights, 2 * (max(int(fullmove), 1) - 1) + (0 if white_to_move else 1),
+                          int(halfmove))
+
+    def set_position(self, board, white_to_move, castling_rights, first_ply=0, halfmove_clock=0):
+        """Replaces the position with a ROWS x COLS grid of pieces (or None).
+
+        Kings and rooks are marked as moved unless one of castling_rights still
+        needs them, so the rights derived from the moved flags match.
+        """
+        for row in board:
+            for piece in row:
+                if piece and piece.piece_type in (KING, ROOK):
+                    piece.moved = True
+        for right, (color, row, rook_col) in CASTLING_HOMES.items():
+            if castling_rights & right:
+                for piece, piece_type in ((board[row][4], KING), (board[row][rook_col], ROOK)):
+                    if not (piece and piece.color == color and piece.piece_type == piece_type):
+                        raise ValueError(f"castling right {right} without its king and rook at home")
+                    piece.moved = False
+
+        self.board = board
+        self.white_to_move = white_to_move
+        self.first_ply = first_ply
+        self.halfmove_clock = halfmove_clock
+        self.undo_stack = []
+        self.index_pieces()
+
+    def to_fen(self):
+        """Returns the position as a FEN string.  The rules have no en passant, so
+        that field is always '-'."""
+        ranks = []
+        for row in self.board:
+            rank = ''
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                letter = FEN_PIECES[piece.piece_type]
+                rank += letter if piece.color == WHITE else letter.lower()
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        castling = ''.join(letter for right, letter in FEN_CASTLING if self.position.castling_rights & right)
+        fullmove = self.ply // 2 + 1
+        return f"{'/'.join(ranks)} {'w' if self.white_to_move else 'b'} {castling or '-'} - {self.halfmove_clock} {fullmove}"
+
+    def index_pieces(self):
+        """Rebuilds everything derived from self.board: bitboards, piece lists,
+        king squares, outcome, castling rights, the Zobrist key and the evaluation sums."""
+        self.position = Position.from_grid(self.board) # Bitboard mirror of self.board
+        self.piece_lists = ([], []) # Pieces still on the board, per color
+        self.king_squares = [None, None] # Per color; None once that king has been captured
+        for row in self.board:
+            for piece in row:
+                if piece:
+                    self.piece_lists[piece.color].append(piece)
+                    if piece.piece_type == KING:
+                        self.king_squares[piece.color] = square(piece.row, piece.col)
+        self.outcome = self._get_outcome() # Winning color code, or None while both kings stand
+        self.position.castling_rights = self._get_castling_rights()
+        self.zobrist_key = hash_position(self.position, self.white_to_move)
+        # Middlegame and endgame scores for white and the game phase, see evaluation.py
+        self.mg_score, self.eg_score, self.phase = score_position(self.position)
+
+    def setup_board(self):
+        # White pieces
+        self.board[7][0] = Piece(WHITE, ROOK, 7, 0)
+        self.board[7][1] = Piece(WHITE, KNIGHT, 7, 1)
+        self.board[7][2] = Piece(WHITE, BISHOP, 7, 2)
+        self.board[7][3] = Piece(WHITE, QUEEN, 7, 3)
+        self.board[7][4] = Piece(WHITE, KING, 7, 4)
+        self.board[7][5] = Piece(WHITE, BISHOP, 7, 5)
+        self.board[7][6] = Piece(WHITE, KNIGHT, 7, 6)
+        self.board[7][7] = Piece(WHITE, ROOK, 7, 7)
+        for i in range(COLS):
+            self.board[6][i] = Piece(WHITE, PAWN, 6, i)
+
+        # Black pieces
+        self.board[0][0] = Piece(BLACK, ROOK, 0, 0)
+        self.board[0][1] = Piece(BLACK, KNIGHT, 0, 1)
+        self.board[0][2] = Piece(BLACK, BISHOP, 0, 2)
+        self.board[0][3] = Piece(BLACK, QUEEN, 0, 3)
+        self.board[0][4] = Piece(BLACK, KING, 0, 4)
+        self.board[0][5] = Piece(BLACK, BISHOP, 0, 5)
+        self.board[0][6] = Piece(BLACK, KNIGHT, 0, 6)
+        self.board[0][7] = Piece(BLACK, ROOK, 0, 7)
+        for i in range(COLS):
+            self.board[1][i] = Piece(BLACK, PAWN, 1, i)
+
+    @property
+    def ply(self):
+        """Plies played since the initial position, counting those before a FEN start."""
+        return self.first_ply + len(self.undo_stack)
+
+    @property
+    def side_to_move(self):
+        """The color code of the side to move."""
+        return WHITE if self.white_to_move else BLACK
+
+    def move_piece(self, start_row, start_col, end_row, end_col):
+        """Moves a piece from start_row, start_col to end_row, end_col."""
+        return self.make_move(encode_coords(start_row, start_col, end_row, end_col))
+
+    def make_move(self, move):
+        """Plays a packed move in place and records what unmake_move needs to take it back.
+        A king moving two columns castles, taking the rook along."""
+        start = move & SQUARE_MASK
+        end = move >> END_SHIFT & SQUARE_MASK
+        start_row, start_col = SQUARE_COORDS[start]
+        end_row, end_col = SQUARE_COORDS[end]
+        piece = self.board[start_row][start_col]
+        if not piece:
+            return False
+
+        position = self.position
+        captured = self.board[end_row][end_col]
+        rook_move = None
+        if piece.piece_type == KING and abs(end_col - start_col) == 2:
+            # Castling: (rook start column, rook end column)
+            rook_move = (COLS - 1 if end_col > start_col else 0, (start_col + end_col) // 2)
+        # Undo record: (move, captured piece, mover's moved flag, castling rook move,
+        #               side to move, castling rights, key, halfmove clock, evaluation sums)
+        self.undo_stack.append((move, captured, piece.moved, rook_move,
+                                self.white_to_move, position.castling_rights, self.zobrist_key,
+                                self.halfmove_clock, self.mg_score, self.eg_score, self.phase))
+        self.halfmove_clock = 0 if captured or piece.piece_type == PAWN else self.halfmove_clock + 1
+
+        # Update the hash and castling rights
+        piece_keys = PIECE_KEYS[piece.color][piece.piece_type]
+        key = self.zobrist_key ^ BLACK_TO_MOVE_KEY ^ piece_keys[start] ^ piece_keys[end]
+        mg_scores, eg_scores = MG_SCORES[piece.color][piece.piece_type], EG_SCORES[piece.color][piece.piece_type]
+        mg_score = self.mg_score + mg_scores[end] - mg_scores[start]
+        eg_score = self.eg_score + eg_scores[end] - eg_scores[start]
+        if captured:
+            key ^= PIECE_KEYS[captured.color][captured.piece_type][end]
+            mg_score -= MG_SCORES[captured.color][captured.piece_type][end]
+            eg_score -= EG_SCORES[captured.color][captured.piece_type][end]
+            self.phase -= PHASE_WEIGHTS[captured.piece_type]
+        rights = position.castling_rights & CASTLING_RIGHTS_KEPT[start] & CASTLING_RIGHTS_KEPT[end]
+        if rights != position.castling_rights:
+            key ^= CASTLING_KEYS[position.castling_rights] ^ CASTLING_KEYS[rights]
+            position.castling_rights = rights
+
+        # Update the bitboards
+        if captured:
+            position.remove(captured.color, captured.piece_type, end)
+            self.piece_lists[captured.color].remove(captured)
+            if captured.piece_type == KING:
+                self.king_squares[captured.color] = None
+                self.outcome = self._get_outcome()
+        position.move(piece.color, piece.piece_type, start, end)
+        if piece.piece_type == KING:
+            self.king_squares[piece.color] = end
+
+        # Update the board
+        self.board[end_row][end_col] = piece
+        self.board[start_row][start_col] = None  # Clear the old position
+
+        # Update the piece's position
+        piece.move(end_row, end_col)
+
+        if rook_move:
+            rook_start_col, rook_end_col = rook_move
+            rook = self.board[start_row][rook_start_col]
+            rook_start, rook_end = square(start_row, rook_start_col), square(start_row, rook_end_col)
+            rook_keys = PIECE_KEYS[rook.color][ROOK]
+            key ^= rook_keys[rook_start] ^ rook_keys[rook_end]
+            mg_score += MG_SCORES[rook.color][ROOK][rook_end] - MG_SCORES[rook.color][ROOK][rook_start]
+            eg_score += EG_SCORES[rook.color][ROOK][rook_end] - EG_SCORES[rook.color][ROOK][rook_start]
+            position.move(rook.color, ROOK, rook_start, rook_end)
+            self.board[start_row][rook_end_col] = rook
+            self.board[start_row][rook_start_col] = None
+            rook.move(start_row, rook_end_col)
+        self.zobrist_key = key
+        self.mg_score, self.eg_score = mg_score, eg_score
+
+        # Switch turns
+        self.white_to_move = not self.white_to_move
+        return True
+
+    def unmake_move(self):
+        """Takes back the last move made with make_move (or move_piece)."""
+        position = self.position
+        (move, captured, moved, rook_move, white_to_move,
+         position.castling_rights, self.zobrist_key, self.halfmove_clock,
+         self.mg_score, self.eg_score, self.phase) = self.undo_stack.pop()
+        start = move & SQUARE_MASK
+        end = move >> END_SHIFT & SQUARE_MASK
+        start_row, start_col = SQUARE_COORDS[start]
+        end_row, end_col = SQUARE_COORDS[end]
+        piece = self.board[end_row][end_col]
+
+        if rook_move:
+            rook_start_col, rook_end_col = rook_move
+            rook = self.board[start_row][rook_end_col]
+            position.move(rook.color, ROOK, square(start_row, rook_end_col), square(start_row, rook_start_col))
+            self.board[start_row][rook_start_col] = rook
+            self.board[start_row][rook_end_col] = None
+            rook.col = rook_start_col
+            rook.moved = False  # Castling requires an unmoved rook
+
+        position.move(piece.color, piece.piece_type, end, start)
+        if piece.piece_type == KING:
+            self.king_squares[piece.color] = start
+        if captured:
+            position.put(captured.color, captured.piece_type, end)
+            self.piece_lists[captured.color].append(captured)
+            if captured.piece_type == KING:
+                self.king_squares[captured.color] = end
+                self.outcome = self._get_outcome()
+
+        self.board[start_row][start_col] = piece
+        self.board[end_row][end_col] = captured
+        piece.row = start_row
+        piece.col = start_col
+        piece.moved = moved
+        self.white_to_move = white_to_move
+
+    def is_valid_move(self, start_row, start_col, end_row, end_col):
+        """Checks if a move is valid based on the piece's movement rules and board state."""
+        piece = self.board[start_row][start_col]
+        if not piece:
+            return False
+
+        # Check turn
+        if piece.color != self.side_to_move:
+            return False
+
+        # Check if the destination is among the piece's moves, stopping at the first match
+        end = square(end_row, end_col)
+        for move in piece.iter_moves(self.position):
+            if move >> END_SHIFT & SQUARE_MASK == end:
+                return True
+        return False
+
+    def iter_moves(self):
+        """Yields the side to move's packed moves lazily, in stages: all captures,
+        then all quiet moves, then castling.
+
+        Target masks are taken for every piece up front, so the caller may make
+        and unmake moves on this board between items (as a search does).
+        """
+        position = self.position
+        color = self.side_to_move
+        occupied = position.occupied
+        targets = []
+        for piece in self.piece_lists[color]:
+            start = square(piece.row, piece.col)
+            targets.append((start, TARGET_GENERATORS[piece.piece_type](position, start, color)))
+        for start, mask in targets:
+            yield from _iter_moves(start, mask & occupied, CAPTURE)
+        for start, mask in targets:
+            yield from _iter_moves(start, mask & ~occupied, 0)
+        king_square = self.king_squares[color]
+        if king_square is not None:
+            row, col = SQUARE_COORDS[king_square]
+            yield from self.board[row][col]._iter_castling_moves(position)
+
+    def get_captures(self):
+        """Returns a MoveList of the side to move's captures only.  Cheaper than
+        generating every move and filtering, since only attack masks against
+        enemy pieces are computed."""
+        position = self.position
+        color = self.side_to_move
+        occupied = position.occupied
+        enemy = position.occupancy[color ^ 1]
+        moves = MoveList()
+        append = moves.append
+        for piece in self.piece_lists[color]:
+            start = piece.row * COLS + piece.col
+            captures = ATTACK_GENERATORS[piece.piece_type](occupied, start, color) & enemy
+            flags = start | CAPTURE
+            while captures:
+                low = captures & -captures
+                append(flags | (low.bit_length() - 1) << END_SHIFT)
+                captures ^= low
+        return moves
+
+    def get_piece(self, row, col):
+        """Returns the piece at the specified row and column, or None if the square is empty."""
+        if 0 <= row < ROWS and 0 <= col < COLS:
+            return self.board[row][col]
+        return None
+
+    def is_square_attacked(self, row, col, attacking_color):
+        """Checks if a square is attacked by the given color."""
+        return self.position.is_attacked(square(row, col), attacking_color)
+
+    def can_castle_kingside(self, color):
+        """Checks if kingside castling is possible."""
+        return self._can_castle(color, CASTLING_RIGHTS[color][0])
+
+    def can_castle_queenside(self, color):
+        """Checks if queenside castling is possible."""
+        return self._can_castle(color, CASTLING_RIGHTS[color][1])
+
+    def _can_castle(self, color, right):
+        square_index = self.king_squares[color]
+        if square_index is None:
+            return False
+        row, col = SQUARE_COORDS[square_index]
+        return self.board[row][col].can_castle(self.position, right)
+
+    def check_win_condition(self):
+        """Checks if any win conditions are met and returns the winning color's name or None"""
+        return None if self.outcome is None else COLOR_NAMES[self.outcome]
+
+    def _get_castling_rights(self):
+        """Derives castling rights from whether the kings and rooks have moved."""
+        rights = 0
+        for right, (color, row, rook_col) in CASTLING_HOMES.items():
+            king = self.board[row][4]
+            rook = self.board[row][rook_col]
+            if (king and king.color == color and king.piece_type == KING and not king.moved and
+                    rook and rook.color == color and rook.piece_type == ROOK and not rook.moved):
+                rights |= right
+        return rights
+
+    def _get_outcome(self):
+        if self.king_squares[WHITE] is None:
+            return BLACK
+        if self.king_squares[BLACK] is None:
+            return WHITE
+        return None # None if no win condition
+
+    def is_repetition(self, count=REPETITION_COUNT):
+        """Returns True if the current position has occurred count times, looking back
+        through the Zobrist keys in the undo stack as far as the last capture or pawn move."""
+        key = self.zobrist_key
+        stack = self.undo_stack
+        seen = 1
+        # Only positions with the same side to move can repeat: every second ply back
+        for back in range(2, min(self.halfmove_clock, len(stack)) + 1, 2):
+            if stack[-back][6] == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def has_insufficient_material(self):
+        """Returns True for the dead positions of standard chess: no pawns, rooks or
+        queens, and either at most one minor piece in total or only bishops, all on
+        squares of one color.  With pseudo-legal moves and king capture these can
+        still be won (a king may step next to the other or into a minor piece's
+        attack), so game.py only adjudicates them on request."""
+        pieces = self.position.pieces
+        for color_pieces in pieces:
+            if color_pieces[PAWN] | color_pieces[ROOK] | color_pieces[QUEEN]:
+                return False
+        knights = pieces[WHITE][KNIGHT] | pieces[BLACK][KNIGHT]
+        bishops = pieces[WHITE][BISHOP] | pieces[BLACK][BISHOP]
+        if popcount(knights | bishops) <= 1:
+            return True
+        return not knights and (not bishops & LIGHT_SQUARES or not bishops & ~LIGHT_SQUARES)
+
+    def get_draw_reason(self, max_plies=None, fifty_move_rule=True, repetition=True, insufficient_material=False):
+        """Returns why the game should be adjudicated a draw under the enabled rules,
+        or None.  max_plies caps the game length (None for no cap); the insufficient
+        material rule is off unless asked for, see has_insufficient_material."""
+        if self.outcome is not None:
+            return None
+        if max_plies is not None and self.ply >= max_plies:
+            return "maximum length"
+        if fifty_move_rule and self.halfmove_clock >= FIFTY_MOVE_PLIES:
+            return "fifty-move rule"
+        if repetition and self.is_repetition():
+            return "threefold repetition"
+        if insufficient_material and self.has_insufficient_material():
+            return "insufficient material"
+        return None
+
+    def is_game_over(self):
+        """Returns True if the game is over (checkmate or stalemate), False otherwise."""
+        return self.outcome is not None
+
+    def get_all_pieces(self, color):
+        """Returns a list of all pieces of a given color on the board."""
+        return list(self.piece_lists[color])
+
+
+class AIPlayer:
+    def __init__(self, color):
+        self.color = color
+
+    def get_best_move(self, board):
+        """Returns the best move for the AI player based on a simple evaluation."""
+        possible_moves = self.get_all_possible_moves(board)
+        if not possible_moves:
+            return None
+
+        # Simple evaluation: choose a random valid move
+        return random.choice(possible_moves)
+
+    def get_all_possible_moves(self, board):
+        """Returns a MoveList of all possible moves for the AI player, as packed ints."""
+        position = board.position
+        possible_moves = MoveList()
+        for piece in board.piece_lists[self.color]:
+            piece.add_moves(position, possible_moves)
+        return possible_moves
@@ -1,6 +1,10 @@
 import pygame
+import os
 import subprocess
 import sys
+import tempfile
+
+import encoding
 
 # --- Constants ---
 WIDTH, HEIGHT = 600, 400
@@ -28,9 +32,12 @@ class GameRunner:
         self.num_games = 10  # Always run 10 games
         self.white_wins = 0
         self.black_wins = 0
+        self.draws = 0 # Games adjudicated drawn (exit code 3)
         self.running = True
         self.game_processes = []  # Store subprocess.Popen objects
         self.exit_codes = [] # Store the exit codes for all the games.
+        self.game_lengths = [] # Plies played in each finished game, from the workers' position records
+        self.result_file = None # Position store the games append their final records to
 
         self.run_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT // 3, 100, 40)
         self.stop_button = pygame.Rect(WIDTH // 2 - 50, HEIGHT // 3 + 50, 100, 40)
@@ -88,11 +95,18 @@ class GameRunner:
         black_wins_text = FONT.render(f"Black Wins: {self.black_wins}", True, BLACK)
         self.screen.blit(white_wins_text, (20, 20))
         self.screen.blit(black_wins_text, (20, 60))
+        draws_text = FONT.render(f"Draws: {self.draws}", True, BLACK)
+        self.screen.blit(draws_text, (20, 100))
 
         # Display Number of Games to Run (fixed at 10)
         num_games_text = FONT.render(f"Number of Games: {self.num_games}", True, BLACK)
         self.screen.blit(num_games_text, (WIDTH - 250, 20))
 
+        if self.game_lengths:
+            average = sum(self.game_lengths) / len(self.game_lengths)
+            length_text = FONT.render(f"Average Length: {average:.0f} plies", True, BLACK)
+            self.screen.blit(length_text, (20, HEIGHT - 90))
+
 
 
     def start_games(self):
@@ -102,11 +116,14 @@ class GameRunner:
         self.status_text = "Running Games..."
         self.game_processes = []  # Clear previous processes
         self.exit_codes = [] # clear previous exit codes.
+        fd, self.result_file = tempfile.mkstemp(suffix=".positions")
+        os.close(fd)
 
         for i in range(self.num_games):
             x = (i % self.grid_width) * self.window_width
             y = (i // self.grid_width) * self.window_height
-            process = subprocess.Popen(["python", "game.py", "--zero-player", "--x", str(x), "--y", str(y)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            process = subprocess.Popen(["python", "game.py", "--zero-player", "--x", str(x), "--y", str(y),
+                                        "--result-file", self.result_file], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             self.game_processes.append(process)
 
         # Monitor the game processes and update wins
@@ -121,6 +138,7 @@ class GameRunner:
             process.wait() # Wait for the process to terminate.
 
         self.game_processes = [] # clear the game processes after they are terminated.
+        self.collect_results()
         self.status_text = "Games Stopped."
 
     def monitor_games(self):
@@ -136,6 +154,8 @@ class GameRunner:
                         self.white_wins += 1
                     elif return_code == 2:
                         self.black_wins += 1
+                    elif return_code == 3:
+                        self.draws += 1
 
                     # Remove the process from the list
                     self.game_processes.pop(i)
@@ -146,8 +166,18 @@ class GameRunner:
             pygame.display.flip()
             pygame.time.delay(10)  # Avoid busy-waiting
 
+        self.collect_results()
         self.status_text = "All games finished."
-        print(f"White Wins: {self.white_wins}, Black Wins: {self.black_wins}")
+        print(f"White Wins: {self.white_wins}, Black Wins: {self.black_wins}, Draws: {self.draws}")
+
+    def collect_results(self):
+        """Reads the final position records the games wrote, then removes the store."""
+        if self.result_file is None:
+            return
+        records = encoding.read_store(self.result_file)
+        self.game_lengths.extend(ply for _, _, ply in encoding.iter_positions(records))
+        os.remove(self.result_file)
+        self.result_file = None
 
 
 if __name__ == "__main__":
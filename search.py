@@ -0,0 +1,403 @@
+"""Search-based AI player: iterative deepening negamax with alpha-beta pruning.
+
+The search plays moves on the board with make_move and takes them back with
+unmake_move, so no positions are copied below the root.  Capturing a king
+ends the game, so a position whose king has gone is scored as lost for the
+side to move; a side with no moves at all scores as a draw, as in game.py.
+
+Each move is searched one ply deeper at a time until the depth limit or the
+time budget is reached.  Best moves are kept in a transposition table, so
+every iteration tries the previous iteration's best move first.  When time
+runs out mid-iteration the search unwinds the board and plays the result of
+the last completed iteration.
+
+Moves are ordered: the table move, then captures by most valuable victim and
+least valuable attacker (MVV-LVA), then the two killer moves of the ply, then
+quiet moves by a from/to history table of earlier cutoffs.
+
+At the depth limit a quiescence search plays out captures only, so leaves are
+not evaluated halfway through an exchange.  The side to move may stand pat on
+the static evaluation, and captures that could not lift the score to alpha
+even when winning the victim outright are skipped (delta pruning).  A side
+whose king is attacked cannot stand pat; near the leaves it searches all of
+its moves instead.
+
+    python search.py --depth 5
+    python search.py --fen "r1bqkb1r/pppp1ppp/2n2n2/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 0 4" --compare
+"""
+import argparse
+import random
+import time
+
+from bitboard import SQUARE_COORDS, KING
+from evaluation import EG_VALUES, MG_VALUES, tapered
+from moves import CAPTURE, END_SHIFT, SQUARE_MASK, MoveList, move_name
+from rules import START_FEN, AIPlayer, Board
+from transposition import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+DEFAULT_DEPTH = 3
+MAX_DEPTH = 64  # Depth limit when only time bounds the search, and the deepest search allowed
+MATE_SCORE = 30000  # Losing the king; stays inside the transposition table's 16-bit scores
+INFINITY = MATE_SCORE + 1
+# Scores beyond this are king captures, MATE_SCORE - ply; quiescence can reach plies past MAX_DEPTH
+MATE_BOUND = MATE_SCORE - 2 * MAX_DEPTH
+
+MOVES_TO_GO = 30  # A game clock is shared out as if this many moves remained
+TIME_CHECK_NODES = 256  # Nodes between checks of the clock
+
+# Per piece type, what capturing it can gain; a king capture always has to be searched
+CAPTURE_GAINS = tuple(max(MG_VALUES[piece_type], EG_VALUES[piece_type]) if piece_type != KING else MATE_SCORE
+                      for piece_type in range(KING + 1))
+DELTA_MARGIN = 200  # Allowance for positional gains on top of the captured material
+QUIESCENCE_EVASION_PLIES = 2  # Quiescence plies in which an attacked king searches all of its moves
+
+# --- Move ordering scores (higher first) ---
+TABLE_MOVE_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 24  # Plus MVV-LVA: piece types are numbered from least to most valuable
+KILLER_SCORES = (1 << 23, (1 << 23) - 1)  # First and second killer slot
+HISTORY_LIMIT = 1 << 20  # History scores are halved once one reaches this
+FROM_TO_MASK = (1 << 2 * END_SHIFT) - 1  # Start and end squares of a packed move, the history index
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget is spent."""
+
+
+def evaluate(board):
+    """Returns the tapered material and piece-square score in centipawns from the
+    side to move's point of view, from the sums the board keeps up to date."""
+    score = tapered(board.mg_score, board.eg_score, board.phase)
+    return score if board.white_to_move else -score
+
+
+def _score_to_table(score, ply):
+    """King-capture scores count plies from the root; the table stores them from the node."""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def _mvv_lva(grid, move):
+    """Ordering score of a capture: the victim's value first, then the attacker's, lowest first."""
+    start_row, start_col = SQUARE_COORDS[move & SQUARE_MASK]
+    end_row, end_col = SQUARE_COORDS[move >> END_SHIFT & SQUARE_MASK]
+    return CAPTURE_SCORE + grid[end_row][end_col].piece_type * 8 + 7 - grid[start_row][start_col].piece_type
+
+
+class SearchAIPlayer(AIPlayer):
+    """An AIPlayer that searches ahead instead of moving at random.
+
+    `depth` caps the search in plies.  `movetime` (milliseconds per move) and
+    `game_time` (milliseconds for the whole game, spent across the moves) bound
+    it by the clock instead; with either of them and no depth, the search goes
+    as deep as the time allows.  Equal-scoring moves at the root are broken at
+    random, so games between two search players still differ from run to run.
+    """
+
+    def __init__(self, color, depth=None, movetime=None, game_time=None, table_mb=16, ordering=True,
+                 quiescence=True):
+        super().__init__(color)
+        if depth is not None and depth < 1:
+            raise ValueError(f"search depth must be at least 1, not {depth}")
+        if depth is None:
+            depth = DEFAULT_DEPTH if movetime is None and game_time is None else MAX_DEPTH
+        self.depth = min(depth, MAX_DEPTH)
+        self.movetime = movetime
+        self.clock = game_time  # Milliseconds left on this player's game clock, or None
+        self.table = TranspositionTable(table_mb)
+        self.deadline = None  # perf_counter() time at which the current search stops
+        self.stopping = False  # Set by stop() to abort searches until resume()
+        self.ordering = ordering  # False searches in AIPlayer.get_all_possible_moves order (table move aside)
+        self.quiescence = quiescence  # False evaluates leaves statically
+        # Per ply: the last two quiet moves that cut off; quiescence evasions order moves past the depth
+        self.killers = [[0, 0] for _ in range(MAX_DEPTH + QUIESCENCE_EVASION_PLIES + 1)]
+        self.history = [0] * (FROM_TO_MASK + 1)  # Per from/to: cutoffs by that quiet move, weighted by depth
+        self.nodes = 0  # Nodes visited by the last search, quiescence nodes included
+        self.quiescence_nodes = 0
+        self.completed_depth = 0  # Deepest iteration the last search finished
+        self.cutoffs = 0  # Beta cutoffs in the last search
+        self.first_move_cutoffs = 0  # Cutoffs made by the first move tried
+        self.cutoff_moves = 0  # Moves searched at nodes that cut off, cutoff move included
+
+    def get_best_move(self, board):
+        """Returns the best move found within the depth and time limits, or None if there are no moves."""
+        start = time.perf_counter()
+        budget = self.move_budget()
+        move, _ = self.iterative_search(board, self.depth, None if budget is None else start + budget)
+        if self.clock is not None:
+            self.clock -= (time.perf_counter() - start) * 1000
+        return move
+
+    def stop(self):
+        """Asks a search running on another thread to return as soon as possible.
+        It returns the last completed iteration's move (None if it had none yet), and
+        later searches return straight away too until resume() is called."""
+        self.stopping = True
+
+    def resume(self):
+        """Lets searches run again after stop().  Call it from the thread that hands
+        out searches, before starting one, so a stop() made meanwhile is not lost."""
+        self.stopping = False
+
+    def search_stats(self):
+        """Returns statistics on the last search: nodes, cutoffs, the share of cutoffs
+        made by the first move tried and the average moves searched per cutoff."""
+        cutoffs = self.cutoffs
+        return {
+            "nodes": self.nodes,
+            "quiescence_nodes": self.quiescence_nodes,
+            "depth": self.completed_depth,
+            "cutoffs": cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / cutoffs if cutoffs else 0.0,
+            "moves_per_cutoff": self.cutoff_moves / cutoffs if cutoffs else 0.0,
+        }
+
+    def move_budget(self):
+        """Returns the seconds to spend on the next move, or None for no time limit."""
+        budgets = []
+        if self.movetime is not None:
+            budgets.append(self.movetime)
+        if self.clock is not None:
+            budgets.append(max(self.clock, 0) / MOVES_TO_GO)
+        return min(budgets) / 1000 if budgets else None
+
+    def iterative_search(self, board, max_depth, deadline=None):
+        """Searches one ply deeper at a time up to max_depth, stopping at the deadline
+        (a time.perf_counter() value).  Returns (best move, score) of the deepest
+        completed iteration; the first iteration always completes.  max_depth is
+        capped at MAX_DEPTH."""
+        max_depth = min(max_depth, MAX_DEPTH)
+        self.nodes = self.quiescence_nodes = 0
+        self.completed_depth = 0
+        self.cutoffs = self.first_move_cutoffs = self.cutoff_moves = 0
+        self.deadline = None
+        self.table.new_search()
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        self.history = [value >> 1 for value in self.history]  # Old cutoffs count for less
+        moves = list(board.iter_moves())
+        random.shuffle(moves)
+        if self.ordering:
+            # A stable sort, so equal moves stay shuffled
+            moves.sort(key=lambda move: _mvv_lva(board.board, move) if move & CAPTURE else 0, reverse=True)
+        root_ply = len(board.undo_stack)
+        best_move, best_score = None, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                best_move, best_score = self.search(board, depth, moves)
+            except SearchTimeout:
+                # Unwind the moves the aborted iteration left on the board
+                while len(board.undo_stack) > root_ply:
+                    board.unmake_move()
+                break
+            self.completed_depth = depth
+            self.deadline = deadline
+            if best_move is None or abs(best_score) > MATE_BOUND:
+                break  # No moves, or a forced king capture found: deeper won't change it
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            # The previous iteration's best move goes first in the next one
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+        return best_move, best_score
+
+    def search(self, board, depth, moves=None):
+        """Searches the position to depth plies and returns (best move, score).
+        moves gives the root moves in the order to try them."""
+        if moves is None:
+            moves = list(board.iter_moves())
+        best_move = None
+        alpha = -INFINITY
+        for move in moves:
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            board.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        if best_move is None:
+            return None, 0
+        self.table.store(board.zobrist_key, depth, EXACT, _score_to_table(alpha, 0), best_move)
+        return best_move, alpha
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        """Returns the score of the position for the side to move, within (alpha, beta)."""
+        self.nodes += 1
+        if self.nodes % TIME_CHECK_NODES == 0 and (
+                self.stopping or self.deadline is not None and time.perf_counter() >= self.deadline):
+            raise SearchTimeout
+        if board.outcome is not None:
+            return -MATE_SCORE + ply  # Our king was just captured; losing later is better
+        if depth == 0:
+            if self.quiescence:
+                self.nodes -= 1  # Counted again as a quiescence node
+                return self._quiescence(board, alpha, beta, ply, 0)
+            return evaluate(board)
+
+        key = board.zobrist_key
+        entry = self.table.probe(key)
+        table_move = 0
+        if entry is not None:
+            entry_depth, bound, score, table_move = entry
+            if entry_depth >= depth:
+                score = _score_from_table(score, ply)
+                if (bound == EXACT or (bound == LOWER_BOUND and score >= beta) or
+                        (bound == UPPER_BOUND and score <= alpha)):
+                    return score
+
+        moves = self._ordered_moves(board, table_move, ply)
+
+        original_alpha = alpha
+        best, best_move = -INFINITY, 0
+        for index, move in enumerate(moves):
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best:
+                best, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self._record_cutoff(move, depth, ply, index)
+                        break
+        if best == -INFINITY:
+            return 0  # No moves: a draw
+
+        if best >= beta:
+            bound = LOWER_BOUND
+        elif best > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+        self.table.store(key, depth, bound, _score_to_table(best, ply), best_move)
+        return best
+
+    def _quiescence(self, board, alpha, beta, ply, quiescence_ply):
+        """Returns the score of the position for the side to move, searching captures only."""
+        self.nodes += 1
+        self.quiescence_nodes += 1
+        if self.nodes % TIME_CHECK_NODES == 0 and (
+                self.stopping or self.deadline is not None and time.perf_counter() >= self.deadline):
+            raise SearchTimeout
+        if board.outcome is not None:
+            return -MATE_SCORE + ply
+
+        color = board.side_to_move
+        king = board.king_squares[color]
+        if quiescence_ply < QUIESCENCE_EVASION_PLIES and board.position.is_attacked(king, color ^ 1):
+            # Standing pat would ignore the threat to the king
+            best = stand_pat = -INFINITY
+            moves = self._ordered_moves(board, 0, ply)
+        else:
+            best = stand_pat = evaluate(board)
+            if stand_pat >= beta:
+                return stand_pat
+            if stand_pat > alpha:
+                alpha = stand_pat
+            grid = board.board
+            moves = sorted(board.get_captures(), key=lambda move: _mvv_lva(grid, move), reverse=True)
+
+        grid = board.board
+        for move in moves:
+            if move & CAPTURE and stand_pat != -INFINITY:
+                end_row, end_col = SQUARE_COORDS[move >> END_SHIFT & SQUARE_MASK]
+                if stand_pat + CAPTURE_GAINS[grid[end_row][end_col].piece_type] + DELTA_MARGIN <= alpha:
+                    continue  # Delta pruning: even winning this piece would not reach alpha
+            board.make_move(move)
+            score = -self._quiescence(board, -beta, -alpha, ply + 1, quiescence_ply + 1)
+            board.unmake_move()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best == -INFINITY:
+            return 0  # No moves: a draw
+        return best
+
+    def _ordered_moves(self, board, table_move, ply):
+        """Returns the side to move's moves in the order to search them."""
+        if not self.ordering:
+            moves = MoveList()
+            for piece in board.piece_lists[board.side_to_move]:  # As AIPlayer.get_all_possible_moves
+                piece.add_moves(board.position, moves)
+            moves = list(moves)
+            if table_move in moves:
+                moves.remove(table_move)
+                moves.insert(0, table_move)
+            return moves
+
+        grid = board.board
+        killer, second_killer = self.killers[ply]
+        history = self.history
+        scored = []
+        for move in board.iter_moves():
+            if move == table_move:
+                score = TABLE_MOVE_SCORE
+            elif move & CAPTURE:
+                score = _mvv_lva(grid, move)
+            elif move == killer:
+                score = KILLER_SCORES[0]
+            elif move == second_killer:
+                score = KILLER_SCORES[1]
+            else:
+                score = history[move & FROM_TO_MASK]
+            scored.append((score, move))
+        scored.sort(reverse=True)
+        return [move for _, move in scored]
+
+    def _record_cutoff(self, move, depth, ply, index):
+        """Updates the statistics, and the killers and history for a quiet cutoff move."""
+        self.cutoffs += 1
+        self.cutoff_moves += index + 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if move & CAPTURE:
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        history = self.history
+        index = move & FROM_TO_MASK
+        history[index] += depth * depth
+        if history[index] >= HISTORY_LIMIT:
+            self.history = [value >> 1 for value in history]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search a position and report node and cutoff statistics")
+    parser.add_argument("--fen", default=START_FEN, help="Position to search (default: the initial position)")
+    parser.add_argument("--depth", type=int, default=4, help="Search depth in plies")
+    parser.add_argument("--compare", action="store_true", help="Also search in plain generation order, for comparison")
+    parser.add_argument("--no-quiescence", action="store_true", help="Evaluate leaves statically, without quiescence search")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("--depth must be at least 1")
+
+    runs = [("ordered", True), ("generation order", False)] if args.compare else [("ordered", True)]
+    for name, ordering in runs:
+        board = Board(args.fen)
+        player = SearchAIPlayer(board.side_to_move, args.depth, ordering=ordering, quiescence=not args.no_quiescence)
+        start = time.perf_counter()
+        move, score = player.iterative_search(board, args.depth)
+        elapsed = time.perf_counter() - start
+        stats = player.search_stats()
+        print(f"{name}: best {move_name(move) if move is not None else '-'} score {score}  "
+              f"nodes {stats['nodes']} ({stats['quiescence_nodes']} quiescence)  time {elapsed:.2f}s  cutoffs {stats['cutoffs']}  "
+              f"first-move cutoffs {stats['first_move_cutoff_rate']:.0%}  "
+              f"moves per cutoff {stats['moves_per_cutoff']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Plays many random games in lockstep to estimate win rates.
+
+Each ply, every unfinished game picks one of its moves uniformly at random,
+exactly as AIPlayer.get_best_move does, and all games are advanced together
+with NumPy through batch.py.  A game ends when a king is captured or the side
+to move has no moves (no winner, as in game.py).  The RNG is seeded, so a run
+can be repeated.
+
+    python simulate.py --games 10000 --seed 1
+"""
+import argparse
+import time
+
+import numpy as np
+
+import batch
+from bitboard import SQUARES, ROOK, KING, square
+from moves import CAPTURE, CASTLE, END_SHIFT, SQUARE_MASK
+from rules import CASTLING_HOMES, CASTLING_PATHS, CASTLING_RIGHTS_KEPT, Board
+
+# --- Outcomes ---
+# A finished game records the winning color code or one of these
+NO_MOVES, UNFINISHED = 2, 3
+IN_PROGRESS = -1
+OUTCOME_NAMES = ('white', 'black', 'no moves', 'unfinished')
+
+RIGHTS_KEPT = np.array(CASTLING_RIGHTS_KEPT, dtype=np.uint8)
+
+
+def _rook_castling_bits():
+    """Per king destination square, the rook's start and end bits when the king castles there."""
+    bits = np.zeros(SQUARES, dtype=np.uint64)
+    for right, (color, row, rook_col) in CASTLING_HOMES.items():
+        king_col, rook_to_col = CASTLING_PATHS[right][:2]
+        bits[square(row, king_col)] = (1 << square(row, rook_col)) | (1 << square(row, rook_to_col))
+    return bits
+
+
+ROOK_CASTLING_BITS = _rook_castling_bits()
+
+
+def play_moves(bitboards, colors, castling, moves):
+    """Plays one packed move on each board in place (castling rights included) and
+    returns the (N,) piece type captured by each move, or -1 for a quiet move.
+    colors is left alone; the caller flips the side to move."""
+    rows = np.arange(len(moves))
+    start = moves & SQUARE_MASK
+    end = moves >> END_SHIFT & SQUARE_MASK
+    start_bit, end_bit = batch.SQUARE_BITS[start], batch.SQUARE_BITS[end]
+    own = colors.astype(np.intp) * 6
+    enemy = 6 - own
+
+    planes = np.arange(6)
+    mover = np.argmax(bitboards[rows[:, None], own[:, None] + planes] & start_bit[:, None] != 0, axis=1)
+    captured = np.where(moves & CAPTURE != 0,
+                        np.argmax(bitboards[rows[:, None], enemy[:, None] + planes] & end_bit[:, None] != 0, axis=1),
+                        -1)
+
+    hit = captured >= 0
+    bitboards[rows[hit], enemy[hit] + captured[hit]] ^= end_bit[hit]
+    bitboards[rows, own + mover] ^= start_bit | end_bit
+    castles = moves & CASTLE != 0
+    bitboards[rows[castles], own[castles] + ROOK] ^= ROOK_CASTLING_BITS[end[castles]]
+    castling &= RIGHTS_KEPT[start] & RIGHTS_KEPT[end]
+    return captured
+
+
+def simulate(games, seed=None, max_plies=None):
+    """Plays `games` random games from the start position.
+
+    Returns (outcomes, lengths): per game the winning color code, NO_MOVES or
+    UNFINISHED (when max_plies was reached), and the number of plies played.
+    """
+    rng = np.random.default_rng(seed)
+    start = Board()
+    bitboards, castling = batch.from_positions([start.position])
+    bitboards = np.repeat(bitboards, games, axis=0)
+    castling = np.repeat(castling, games)
+    colors = np.full(games, start.side_to_move, dtype=np.uint8)
+    outcomes = np.full(games, IN_PROGRESS, dtype=np.int8)
+    lengths = np.zeros(games, dtype=np.int32)
+
+    active = np.arange(games)
+    while len(active):
+        if max_plies is not None and lengths[active[0]] >= max_plies:
+            outcomes[active] = UNFINISHED
+            break
+        moves, counts = batch.move_arrays(bitboards[active], colors[active], castling[active])
+        stuck = counts == 0
+        outcomes[active[stuck]] = NO_MOVES
+        active, moves, counts = active[~stuck], moves[~stuck], counts[~stuck]
+
+        picks = (rng.random(len(active)) * counts).astype(np.intp)
+        chosen = moves[np.arange(len(active)), picks]
+        played_bitboards, played_castling = bitboards[active], castling[active]
+        captured = play_moves(played_bitboards, colors[active], played_castling, chosen)
+        bitboards[active], castling[active] = played_bitboards, played_castling
+        lengths[active] += 1
+
+        # Capturing a king wins for the side that moved
+        won = captured == KING
+        outcomes[active[won]] = colors[active[won]]
+        colors[active] ^= 1
+        active = active[~won]
+    return outcomes, lengths
+
+
+def outcome_counts(outcomes):
+    """Returns {outcome name: number of games} for every outcome."""
+    counts = np.bincount(outcomes[outcomes >= 0], minlength=len(OUTCOME_NAMES))
+    return {name: int(count) for name, count in zip(OUTCOME_NAMES, counts)}
+
+
+def length_histogram(lengths, bin_width=20):
+    """Returns [(first ply of the bin, number of games)] for game lengths in bins of bin_width plies."""
+    counts = np.bincount(lengths // bin_width)
+    return [(index * bin_width, int(count)) for index, count in enumerate(counts) if count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play random AI games in lockstep and report win rates")
+    parser.add_argument("--games", type=int, default=10000, help="Number of games to play")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed, for repeatable runs")
+    parser.add_argument("--max-plies", type=int, default=None, help="Stop games after this many plies")
+    parser.add_argument("--bin-width", type=int, default=20, help="Plies per game-length histogram bin")
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.bin_width < 1:
+        parser.error("--bin-width must be at least 1")
+
+    start = time.perf_counter()
+    outcomes, lengths = simulate(args.games, args.seed, args.max_plies)
+    elapsed = time.perf_counter() - start
+
+    print(f"Played {args.games} games in {elapsed:.1f}s")
+    for name, count in outcome_counts(outcomes).items():
+        print(f"{name:<11} {count:>8}  {count / args.games:6.1%}")
+    print(f"Plies: mean {lengths.mean():.1f}, min {lengths.min()}, max {lengths.max()}")
+    peak = max(count for _, count in length_histogram(lengths, args.bin_width))
+    for first, count in length_histogram(lengths, args.bin_width):
+        print(f"{first:>5}-{first + args.bin_width - 1:<5} {count:>7} {'#' * max(1, 50 * count // peak)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Fixed-size transposition table keyed by Board.zobrist_key.
+
+Entries live in two flat unsigned 64-bit arrays (keys and packed data), so
+memory is allocated once up front and never grows however long a session
+runs.  The table is split into two-slot buckets: the first slot keeps the
+deepest entry of the current search generation, the second is always
+replaced.  Entries from older generations count as stale and lose to
+anything new.
+"""
+from array import array
+
+# --- Bound types ---
+EXACT, LOWER_BOUND, UPPER_BOUND = 1, 2, 3
+
+ENTRY_SIZE = 16  # bytes per slot: 8 for the key, 8 for the packed data
+SLOTS_PER_BUCKET = 2
+SCORE_OFFSET = 1 << 15  # scores are stored as unsigned 16-bit values
+
+# Packed data layout (low to high): move 16 bits, score 16, depth 8, bound 8, generation 8.
+# A zero data word marks an empty slot, which is why bound types start at 1.
+_SCORE_SHIFT, _DEPTH_SHIFT, _BOUND_SHIFT, _GENERATION_SHIFT = 16, 32, 40, 48
+
+
+class TranspositionTable:
+    """Bounded store of search results: depth, bound type, score and best move.
+
+    `size_mb` sets the memory budget; the bucket count is rounded down to a
+    power of two.  Scores must fit in a signed 16-bit integer and moves in 16
+    bits (0 meaning no move).
+    """
+
+    def __init__(self, size_mb=16):
+        buckets = max(1, size_mb * 1024 * 1024 // (ENTRY_SIZE * SLOTS_PER_BUCKET))
+        buckets = 1 << (buckets.bit_length() - 1)
+        self.bucket_mask = buckets - 1
+        self.keys = array('Q', bytes(8 * SLOTS_PER_BUCKET * buckets))
+        self.data = array('Q', bytes(8 * SLOTS_PER_BUCKET * buckets))
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0  # stores that evicted a different position
+
+    def __len__(self):
+        """Returns the number of slots (the maximum number of entries held)."""
+        return len(self.keys)
+
+    def new_search(self):
+        """Starts a new generation; entries from earlier searches become replaceable."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        """Empties the table and resets the counters."""
+        self.keys = array('Q', bytes(8 * len(self.keys)))
+        self.data = array('Q', bytes(8 * len(self.data)))
+        self.generation = 0
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def probe(self, key):
+        """Returns (depth, bound, score, move) stored for key, or None."""
+        slot = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        keys = self.keys
+        for slot in (slot, slot + 1):
+            if keys[slot] == key:
+                data = self.data[slot]
+                if data:
+                    self.hits += 1
+                    return ((data >> _DEPTH_SHIFT) & 0xFF,
+                            (data >> _BOUND_SHIFT) & 0xFF,
+                            ((data >> _SCORE_SHIFT) & 0xFFFF) - SCORE_OFFSET,
+                            data & 0xFFFF)
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, bound, score, move=0):
+        """Records a search result, keeping the deeper entry in each bucket's first slot."""
+        first = (key & self.bucket_mask) * SLOTS_PER_BUCKET
+        second = first + 1
+        keys, table = self.keys, self.data
+        if keys[second] == key and table[second]:
+            if not move:
+                move = table[second] & 0xFFFF  # Keep the old best move for ordering
+            table[second] = 0
+        elif keys[first] == key and table[first] and not move:
+            move = table[first] & 0xFFFF
+        data = (move | (score + SCORE_OFFSET) << _SCORE_SHIFT | depth << _DEPTH_SHIFT |
+                bound << _BOUND_SHIFT | self.generation << _GENERATION_SHIFT)
+        self.stores += 1
+
+        old = table[first]
+        if (not old or keys[first] == key or (old >> _GENERATION_SHIFT) != self.generation or
+                depth >= (old >> _DEPTH_SHIFT) & 0xFF):
+            if old and keys[first] != key:
+                # Demote the displaced entry to the always-replace slot
+                if table[second]:
+                    self.overwrites += 1
+                keys[second], table[second] = keys[first], old
+            keys[first], table[first] = key, data
+        else:
+            if table[second]:
+                self.overwrites += 1
+            keys[second], table[second] = key, data
+
+    def hit_rate(self):
+        """Returns the fraction of probes that found an entry."""
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
@@ -0,0 +1,32 @@
+"""Zobrist keys for Board positions.
+
+A position's key is the XOR of one random 64-bit number per occupied
+(color, piece type, square), one for black to move and one for the current
+castling rights.  A move changes only a handful of those terms, so Board
+updates its key with a few XORs instead of rehashing the whole position.
+"""
+import random
+
+from bitboard import COLORS, PIECE_TYPES, SQUARES, iter_squares
+
+_random = random.Random(0x5EED)  # Fixed seed so keys agree across runs and processes
+
+PIECE_KEYS = tuple(  # [color][piece type][square]
+    tuple(tuple(_random.getrandbits(64) for _ in range(SQUARES)) for _ in PIECE_TYPES)
+    for _ in COLORS
+)
+BLACK_TO_MOVE_KEY = _random.getrandbits(64)
+CASTLING_KEYS = tuple(_random.getrandbits(64) for _ in range(16))  # Indexed by the castling-rights bits
+
+
+def hash_position(position, white_to_move):
+    """Computes the key of a position from scratch."""
+    key = CASTLING_KEYS[position.castling_rights]
+    if not white_to_move:
+        key ^= BLACK_TO_MOVE_KEY
+    for color in COLORS:
+        for piece_type, mask in enumerate(position.pieces[color]):
+            keys = PIECE_KEYS[color][piece_type]
+            for sq in iter_squares(mask):
+                key ^= keys[sq]
+    return key